@@ -0,0 +1,184 @@
+from enum import Enum
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from api.structures import EnumMixin
+
+
+class DecimationFilter(EnumMixin, Enum):
+    Boxcar = "boxcar"
+    CIC = "cic"
+    FIR = "fir"
+
+
+def design_kernel(factor: int, kind: DecimationFilter) -> np.ndarray:
+    """
+    Designs the anti-aliasing kernel of a decimation by ``factor``.
+
+    The kernel is symmetric, sums to 1 and spans an odd number of output
+    periods, ``(2 * k + 1) * factor`` samples, so every output point is
+    centered on the ``factor`` raw samples it replaces.
+
+    Filters:
+        Boxcar: the mean of the ``factor`` samples, the former EpR averaging.
+        CIC: three cascaded boxcars, the impulse response of a third order
+            CIC decimator, three times the boxcar rejection in dB around the
+            alias frequencies.
+        FIR: a Blackman windowed sinc over ``Decimator.fir_length`` output
+            periods, flat to about half the output Nyquist frequency and at
+            least 70 dB down from the Nyquist frequency on.
+    """
+    if kind == DecimationFilter.Boxcar:
+        return np.full(factor, 1 / factor)
+    if kind == DecimationFilter.CIC:
+        kernel = np.ones(factor)
+        for _ in range(Decimator.cic_order - 1):
+            kernel = np.convolve(kernel, np.ones(factor))
+        # Pad the 3 * factor - 2 taps to whole output periods.
+        kernel = np.pad(kernel, (Decimator.cic_order - 1) // 2)
+        return kernel / kernel.sum()
+    taps = Decimator.fir_length * factor
+    cutoff = 0.5 / factor - 2.75 / taps
+    kernel = 2 * cutoff * np.sinc(2 * cutoff * (np.arange(taps) - (taps - 1) / 2)) * np.blackman(taps)
+    return kernel / kernel.sum()
+
+
+class Decimator:
+    """
+    Streaming decimation of one channel by an integer factor.
+
+    Blocks of any size are filtered as one continuous signal: the raw
+    samples a pending output point still needs are kept between calls. The
+    kernel is applied in polyphase form, one matrix product per call, so the
+    cost per raw sample is one multiply-add per output period of the kernel.
+    Output point ``i`` of a segment is centered on raw samples
+    ``[i * factor, (i + 1) * factor)``, which is what ``Timebase`` assumes;
+    the segment edges are extended with their first and last sample. Given
+    the device sample counters of the blocks, a jump ends the segment.
+
+    Attributes:
+        factor (int): Raw samples per output point.
+        kind (DecimationFilter): Anti-aliasing filter.
+        kernel (np.ndarray): Filter taps.
+    """
+
+    cic_order = 3
+    fir_length = 21
+
+    def __init__(self, factor: int, kind: DecimationFilter = DecimationFilter.FIR):
+        if factor < 1:
+            raise ValueError("factor must be positive")
+        self.factor = factor
+        self.kind = kind
+        self.kernel = design_kernel(factor, kind)
+        self._periods = len(self.kernel) // factor
+        self._phases = self.kernel.reshape(self._periods, factor).T.copy()
+        self._history: Optional[np.ndarray] = None
+        self._pending: List[np.ndarray] = []
+        self._pending_count = 0
+        self._next_index: Optional[int] = None
+
+    @property
+    def delay(self) -> int:
+        """Raw samples that arrive after the last one an output point is centered on before it is emitted."""
+        return (self._periods - 1) // 2 * self.factor
+
+    def process(self, samples: np.ndarray, index: Optional[int] = None) -> np.ndarray:
+        """
+        Filters the next samples of the current segment.
+
+        Parameters:
+            samples (np.ndarray): Raw samples.
+            index (int): Device sample counter of the first sample, a jump flushes the segment first.
+
+        Returns:
+            np.ndarray: Output points completed by the samples, possibly none.
+        """
+        if not len(samples):
+            return np.empty(0)
+        if index is not None:
+            if self._next_index is not None and index != self._next_index:
+                flushed = self.flush()
+                return np.concatenate((flushed, self.process(samples, index)))
+            self._next_index = index + len(samples)
+        if self._history is None:
+            self._history = np.full(self.delay, samples[0], dtype=np.float64)
+        self._pending.append(samples)
+        self._pending_count += len(samples)
+        if len(self._history) + self._pending_count < self._periods * self.factor:
+            return np.empty(0)
+        return self._filter()
+
+    def flush(self) -> np.ndarray:
+        """
+        Ends the current segment, e.g. at a gap, and returns its remaining output points.
+
+        The next ``process`` call starts a new segment.
+        """
+        if self._history is None:
+            return np.empty(0)
+        if self.delay:
+            last = self._pending[-1][-1] if self._pending else self._history[-1]
+            self._pending.append(np.full(self.delay, last))
+            self._pending_count += self.delay
+        points = self._filter()
+        self.reset()
+        return points
+
+    def reset(self) -> None:
+        self._history = None
+        self._pending = []
+        self._pending_count = 0
+        self._next_index = None
+
+    def _filter(self) -> np.ndarray:
+        samples = np.concatenate([self._history, *self._pending])
+        self._pending = []
+        self._pending_count = 0
+        rows = len(samples) // self.factor
+        count = rows - self._periods + 1
+        if count <= 0:
+            self._history = samples
+            return np.empty(0)
+        # products[row, period]: the row of raw samples weighted by one period of the kernel.
+        products = samples[: rows * self.factor].reshape(rows, self.factor) @ self._phases
+        points = products[:count, 0].copy()
+        for period in range(1, self._periods):
+            points += products[period : period + count, period]
+        self._history = samples[count * self.factor :]
+        return points
+
+
+def decimation_factor(sample_rate: float, output_rate: float) -> int:
+    """Returns the integer factor closest to ``sample_rate / output_rate``, at least 1."""
+    return max(1, round(sample_rate / output_rate))
+
+
+def stream_factors(sample_rate: float, store_raw: bool, output_rates: Iterable[float]) -> List[int]:
+    """
+    Returns the decimation factors of the stored streams, the first one is the primary stream.
+
+    Parameters:
+        sample_rate (float): ADC sample rate per channel, Hz.
+        store_raw (bool): Store the raw samples, as the primary stream.
+        output_rates (Iterable[float]): Rates of the decimated streams, Hz.
+
+    Returns:
+        List[int]: Unique factors, ``[1]`` if nothing else was asked for.
+    """
+    factors = [1] if store_raw else []
+    for rate in output_rates:
+        factor = decimation_factor(sample_rate, rate)
+        if factor not in factors:
+            factors.append(factor)
+    return factors or [1]
+
+
+def stream_name(factor: int, kind: DecimationFilter) -> str:
+    return "raw" if factor == 1 else f"{kind.value}_{factor}"
+
+
+def stream_attrs(sample_rate: float, factor: int, kind: DecimationFilter) -> Dict[str, Any]:
+    """Returns HDF5 attributes describing a stream."""
+    return {"sample_rate": sample_rate / factor, "decimation": factor, "filter": kind.value if factor > 1 else ""}
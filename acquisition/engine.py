@@ -0,0 +1,311 @@
+import logging
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+from acquisition.frame import Frame
+from acquisition.metrics import LatencyHistogram
+from acquisition.reader import DeviceReader
+from acquisition.timebase import Timebase
+from api.structures import DAQSampleRate, DAQVoltage
+
+logger = logging.getLogger(__name__)
+
+
+class Sink:
+    """
+    A consumer of the blocks an AcquisitionEngine reads.
+
+    Sinks are called from the thread that polls the engine, in registration
+    order, and should return quickly: a slow sink delays the next poll but
+    never the device, which keeps being drained by the reader thread.
+    """
+
+    def open(self, engine: "AcquisitionEngine") -> None:
+        """Called once collection started, or on registration if it already did."""
+
+    def write(self, channel: int, index: int, blocks: np.ndarray, means: np.ndarray) -> None:
+        """
+        Receives new samples of one channel.
+
+        Parameters:
+            channel (int): One-based channel number.
+            index (int): Device sample counter of the first sample, a jump means lost samples.
+            blocks (np.ndarray): New samples, one EpR block per row.
+            means (np.ndarray): Mean of every block.
+        """
+
+    def frame(self, frame: Frame) -> None:
+        """Receives the frame built after every poll that read samples."""
+
+    def close(self) -> None:
+        """Called once after the engine stopped and the remaining samples were dispatched."""
+
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Returns counters of the sink to include in ``AcquisitionEngine.metrics``.
+
+        Numeric counters reported by several sinks, e.g. one StoreSink per
+        stream, are summed.
+        """
+        return {}
+
+
+class AcquisitionEngine:
+    """
+    GUI independent acquisition: device configuration, read scheduling and timestamps.
+
+    A DeviceReader thread drains the device into ring buffers; ``poll`` reads
+    the complete EpR blocks written since the previous call and dispatches
+    them to the registered sinks, then builds one Frame for all channels.
+
+    Attributes:
+        channels (List[int]): One-based channel numbers, sorted.
+        duration (float): Seconds after which ``is_running`` turns False, None to run until stopped.
+        sinks (List[Sink]): Registered sinks.
+        reader (DeviceReader): Reader thread, created by ``start``.
+        started (float): ``time.time()`` when collection started, the epoch time of device sample 0.
+        overruns (Dict[int, int]): Samples per channel overwritten in the rings before they were polled.
+        dropped (Dict[int, int]): Samples per channel the device dropped before they were read.
+        lost_rate (float): Overrun and dropped samples per second of all channels, over the last ``rate_interval``.
+        loop_time (LatencyHistogram): Duration of every ``poll``, sinks included.
+    """
+
+    rate_interval = 1.0
+
+    def __init__(
+        self,
+        channels: List[int],
+        voltage: DAQVoltage,
+        sample_rate: DAQSampleRate,
+        read_elements_count: int,
+        duration: Optional[float] = None,
+        target_latency: float = 0.02,
+        daq_class=None,
+        reader=None,
+    ):
+        """
+        Initializes the engine, the device is opened by ``start``.
+
+        Parameters:
+            reader: Object with the DeviceReader interface to poll instead of the
+                device, e.g. a SharedRingReader in a consumer process.
+        """
+        self.channels = sorted(channels)
+        self.voltage = voltage
+        self.sample_rate = sample_rate
+        self.read_elements_count = read_elements_count
+        self.duration = duration
+        self.target_latency = target_latency
+        self.daq_class = daq_class
+        self.sinks: List[Sink] = []
+        self.reader: Optional[DeviceReader] = reader
+        self.started = 0.0
+        self.overruns: Dict[int, int] = {channel: 0 for channel in self.channels}
+        self.dropped: Dict[int, int] = {channel: 0 for channel in self.channels}
+        self.lost_rate = 0.0
+        self._rate_started = 0.0
+        self._rate_lost = 0
+        self.loop_time = LatencyHistogram()
+        self._cursors: Dict[int, int] = {channel: 0 for channel in self.channels}
+        self._closed = False
+
+    def add_sink(self, sink: Sink) -> Sink:
+        self.sinks.append(sink)
+        if self.started:
+            sink.open(self)
+        return sink
+
+    @property
+    def elapsed(self) -> float:
+        return time.time() - self.started if self.started else 0.0
+
+    @property
+    def is_running(self) -> bool:
+        if self.reader is None or not self.reader.is_running:
+            return False
+        return self.duration is None or self.elapsed <= self.duration
+
+    def timebase(self, decimation: int = 1) -> Timebase:
+        """Returns an empty Timebase of a stream with ``decimation`` raw samples per point."""
+        return Timebase(self.started, self.sample_rate.value, decimation)
+
+    @property
+    def poll_interval(self) -> float:
+        return max(self.target_latency, self.read_elements_count / self.sample_rate.value)
+
+    def start(self) -> None:
+        """
+        Connects to the device and starts collection.
+
+        Raises:
+            DeviceError: If the device could not be opened or configured.
+        """
+        if self.reader is None:
+            self.reader = DeviceReader(
+                channels=self.channels,
+                voltage=self.voltage,
+                sample_rate=self.sample_rate,
+                read_elements_count=self.read_elements_count,
+                target_latency=self.target_latency,
+                daq_class=self.daq_class,
+            )
+        self.reader.start()
+        self.reader.ready.wait()
+        if self.reader.error:
+            self.reader.join()
+            raise self.reader.error
+        self.started = self.reader.started or time.time()
+        self._rate_started = time.perf_counter()
+        for sink in self.sinks:
+            sink.open(self)
+
+    def poll(self) -> Optional[Frame]:
+        """
+        Dispatches the complete blocks written since the previous poll.
+
+        Returns:
+            Frame: Latest block means of the channels that had new blocks, or None.
+        """
+        started = time.perf_counter()
+        channels = []
+        block_times = []
+        block_means = []
+        for channel in self.channels:
+            ring = self.reader.rings[channel]
+            index, blocks = self._read_blocks(channel, ring, self._cursors[channel])
+            if not len(blocks):
+                self._cursors[channel] = index
+                continue
+            self._cursors[channel] = index + blocks.size
+            means = blocks.mean(axis=1)
+            for sink in self.sinks:
+                sink.write(channel, index, blocks, means)
+            channels.append(channel)
+            block_times.append(
+                (index + self.read_elements_count * np.arange(1, len(means) + 1)) / self.sample_rate.value
+            )
+            block_means.append(means)
+        if started - self._rate_started >= self.rate_interval:
+            lost = sum(self.overruns.values()) + sum(self.dropped.values())
+            self.lost_rate = (lost - self._rate_lost) / (started - self._rate_started)
+            self._rate_started = started
+            self._rate_lost = lost
+        if not channels:
+            self.loop_time.record(time.perf_counter() - started)
+            return None
+        indexes = np.fromiter((self._cursors[channel] for channel in channels), dtype=np.int64, count=len(channels))
+        # Sample counters, not the clock: the time of the newest sample since device sample 0.
+        frame = Frame(
+            indexes.max() / self.sample_rate.value,
+            tuple(channels),
+            np.array([means[-1] for means in block_means]),
+            indexes,
+            tuple(block_times),
+            tuple(block_means),
+        )
+        for sink in self.sinks:
+            sink.frame(frame)
+        self.loop_time.record(time.perf_counter() - started)
+        return frame
+
+    def _read_blocks(self, channel: int, ring, cursor: int):
+        """Reads the complete blocks after ``cursor`` and accounts for the samples lost before them."""
+        while True:
+            index, blocks = ring.read_blocks(cursor, self.read_elements_count)
+            if index > cursor:
+                dropped = ring.skipped(cursor, index)
+                self.dropped[channel] += dropped
+                if index - cursor > dropped:
+                    self.overruns[channel] += index - cursor - dropped
+                    logger.debug(f"Channel {channel} lost {index - cursor - dropped} samples, polling fell behind")
+            if len(blocks):
+                return index, blocks
+            gap = ring.next_gap(index)
+            if gap is None or gap[0] - index >= self.read_elements_count:
+                return index, blocks
+            # The samples before a gap that do not fill a block are never completed, they are lost with it.
+            logger.debug(f"Channel {channel} lost {gap[0] - index} samples of a block cut by a device gap")
+            self.dropped[channel] += gap[1] - index
+            cursor = gap[1]
+
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Returns a JSON-serializable snapshot of the acquisition counters.
+
+        It may be called from any thread; counters written by other threads
+        meanwhile make the snapshot approximate, never inconsistent in type.
+        """
+        elapsed = self.elapsed
+        snapshot: Dict[str, Any] = {"elapsed_s": elapsed, "loop_time": self.loop_time.to_dict()}
+        if self.reader is not None:
+            rings = self.reader.rings
+            acquired = {channel: rings[channel].write_index for channel in self.channels}
+            snapshot.update(
+                {
+                    "expected_samples": int(elapsed * self.sample_rate.value),
+                    "acquired_samples": acquired,
+                    "backlog_samples": {channel: acquired[channel] - self._cursors[channel] for channel in acquired},
+                    "overrun_samples": dict(self.overruns),
+                    "dropped_samples": dict(self.dropped),
+                    "lost_rate": self.lost_rate,
+                }
+            )
+            metrics = self.reader.metrics
+            if metrics is not None:
+                snapshot.update(
+                    {
+                        "read_latency": metrics.read_latency.to_dict(),
+                        "read_calls": metrics.read_calls,
+                        "read_failures": dict(metrics.read_failures),
+                        "read_timeouts": self.reader.scheduler.timeouts,
+                        "buffer_overflows": dict(metrics.buffer_overflows),
+                    }
+                )
+        for sink in self.sinks:
+            for name, value in sink.metrics().items():
+                if isinstance(snapshot.get(name), (int, float)) and isinstance(value, (int, float)):
+                    value += snapshot[name]
+                snapshot[name] = value
+        return snapshot
+
+    def stop(self) -> None:
+        """
+        Stops the reader, dispatches the samples still in the rings and closes the sinks.
+
+        Raises:
+            DeviceError: If the device failed while reading.
+        """
+        if self._closed or not self.started:
+            return
+        self._closed = True
+        self.reader.stop()
+        self.reader.join()
+        try:
+            self.poll()
+        finally:
+            for sink in self.sinks:
+                sink.close()
+        if self.reader.error:
+            raise self.reader.error
+
+    def run(self, keep_running: Optional[Callable[[], bool]] = None) -> None:
+        """
+        Polls the engine every ``target_latency`` until it stops, starting it first if needed.
+
+        Parameters:
+            keep_running (Callable[[], bool]): Extra stop condition checked before every poll.
+
+        Raises:
+            DeviceError: If the device could not be opened or failed while reading.
+        """
+        if not self.started:
+            self.start()
+        interval = self.poll_interval
+        try:
+            while self.is_running and (keep_running is None or keep_running()):
+                time.sleep(interval)
+                self.poll()
+        finally:
+            self.stop()
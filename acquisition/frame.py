@@ -0,0 +1,41 @@
+from typing import Optional, Tuple
+
+import numpy as np
+
+
+class Frame:
+    """
+    One acquisition update handed from the measure thread to the UI.
+
+    Attributes:
+        time (float): Seconds since the measurement started, counted in device samples.
+        channels (Tuple[int, ...]): One-based channel numbers, in ``values`` order.
+        values (np.ndarray): Latest EpR block mean of every channel, V.
+        indexes (np.ndarray): Absolute ring buffer index reached by every channel,
+            for consumers that read the raw samples themselves.
+        block_times (Tuple[np.ndarray, ...]): End time of every block dispatched
+            since the previous frame, s, one array per channel in ``channels`` order.
+        block_means (Tuple[np.ndarray, ...]): Mean of those blocks, V; None if the
+            frame only carries ``values``.
+    """
+
+    __slots__ = ("time", "channels", "values", "indexes", "block_times", "block_means")
+
+    def __init__(
+        self,
+        time: float,
+        channels: Tuple[int, ...],
+        values: np.ndarray,
+        indexes: Optional[np.ndarray] = None,
+        block_times: Optional[Tuple[np.ndarray, ...]] = None,
+        block_means: Optional[Tuple[np.ndarray, ...]] = None,
+    ):
+        self.time = time
+        self.channels = channels
+        self.values = values
+        self.indexes = indexes
+        self.block_times = block_times
+        self.block_means = block_means
+
+    def __len__(self) -> int:
+        return len(self.channels)
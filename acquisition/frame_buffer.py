@@ -0,0 +1,48 @@
+import threading
+from collections import deque
+from typing import List, Tuple
+
+from acquisition.frame import Frame
+
+
+class FrameBuffer:
+    """
+    Coalesces updates pushed by an acquisition thread until a consumer takes them.
+
+    The producer never waits for the consumer and never posts events: updates
+    are appended under a short lock, and the consumer takes everything pushed
+    since its previous frame in one call. If the consumer stalls, the oldest
+    updates beyond ``max_updates`` are dropped.
+
+    Attributes:
+        max_updates (int): Updates kept between two frames.
+    """
+
+    def __init__(self, max_updates: int = 1000):
+        self.max_updates = max_updates
+        self._lock = threading.Lock()
+        self._updates = deque(maxlen=max_updates)
+        self._pushed = 0
+
+    def __len__(self) -> int:
+        return len(self._updates)
+
+    def push(self, update: Frame) -> None:
+        with self._lock:
+            self._updates.append(update)
+            self._pushed += 1
+
+    def take(self) -> Tuple[List[Frame], int]:
+        """
+        Takes the pending updates.
+
+        Returns:
+            tuple: Pending updates, oldest first, and the number of updates
+            pushed since the previous call, including dropped ones.
+        """
+        with self._lock:
+            updates = list(self._updates)
+            pushed = self._pushed
+            self._updates.clear()
+            self._pushed = 0
+        return updates, pushed
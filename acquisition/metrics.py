@@ -0,0 +1,137 @@
+import json
+import logging
+import threading
+from bisect import bisect_right
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class LatencyHistogram:
+    """
+    A fixed-bucket histogram of durations, cheap enough to record every driver call.
+
+    Buckets are log-spaced from ``10 ** min_exponent`` to ``10 ** max_exponent``
+    seconds with ``per_decade`` buckets per decade, plus an underflow and an
+    overflow bucket. Recording is one ``bisect`` and one list increment.
+
+    Attributes:
+        edges (List[float]): Upper bounds of the buckets, s.
+        counts (List[int]): Recorded durations per bucket, the last one is the overflow.
+        count (int): Recorded durations.
+        total (float): Sum of the recorded durations, s.
+        max (float): Longest recorded duration, s.
+    """
+
+    def __init__(self, min_exponent: int = -6, max_exponent: int = 1, per_decade: int = 10):
+        self.edges: List[float] = [
+            10 ** (min_exponent + i / per_decade) for i in range((max_exponent - min_exponent) * per_decade + 1)
+        ]
+        self.counts: List[int] = [0] * (len(self.edges) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, duration: float) -> None:
+        self.counts[bisect_right(self.edges, duration)] += 1
+        self.count += 1
+        self.total += duration
+        if duration > self.max:
+            self.max = duration
+
+    def percentile(self, percent: float) -> float:
+        """
+        Returns the upper bound of the bucket holding the given percentile, s.
+        """
+        if not self.count:
+            return 0.0
+        rank = self.count * percent / 100
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                return min(self.edges[index], self.max) if index < len(self.edges) else self.max
+        return self.max
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def to_dict(self) -> Dict[str, float]:
+        """Summary in milliseconds."""
+        return {
+            "count": self.count,
+            "mean_ms": self.mean * 1000,
+            "p50_ms": self.percentile(50) * 1000,
+            "p90_ms": self.percentile(90) * 1000,
+            "p99_ms": self.percentile(99) * 1000,
+            "max_ms": self.max * 1000,
+        }
+
+
+class ReaderMetrics:
+    """
+    Counters of a DeviceReader, written by its thread only.
+
+    Attributes:
+        read_latency (LatencyHistogram): Duration of every ``read_block`` call,
+            one ``DAQ122_TryReadData`` per channel.
+        read_calls (int): ``read_block`` calls.
+        read_failures (Dict[int, int]): Failed ``DAQ122_TryReadData`` calls by channel number.
+        buffer_overflows (Dict[int, int]): Reads that found the driver buffer full by channel number.
+    """
+
+    def __init__(self, channels: List[int]):
+        self.read_latency = LatencyHistogram()
+        self.read_calls = 0
+        self.read_failures: Dict[int, int] = {channel: 0 for channel in channels}
+        self.buffer_overflows: Dict[int, int] = {channel: 0 for channel in channels}
+
+    def record(self, elapsed: float, channels: List[int], success) -> None:
+        self.read_latency.record(elapsed)
+        self.read_calls += 1
+        if not success.all():
+            for channel, succeeded in zip(channels, success):
+                if not succeeded:
+                    self.read_failures[channel] += 1
+
+
+class MetricsServer:
+    """
+    Serves ``AcquisitionEngine.metrics()`` as JSON on ``http://host:port/metrics`` from a daemon thread.
+
+    Attributes:
+        address (tuple): Bound host and port.
+    """
+
+    def __init__(self, engine, port: int = 8122, host: str = "127.0.0.1"):
+        self.engine = engine
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(handler):
+                if handler.path.rstrip("/") not in ("", "/metrics"):
+                    handler.send_error(404)
+                    return
+                body = json.dumps(engine.metrics()).encode()
+                handler.send_response(200)
+                handler.send_header("Content-Type", "application/json")
+                handler.send_header("Content-Length", str(len(body)))
+                handler.end_headers()
+                handler.wfile.write(body)
+
+            def log_message(handler, format, *args):
+                logger.debug(format % args)
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        self.address = self._server.server_address
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
@@ -0,0 +1,156 @@
+import logging
+import threading
+import time
+from typing import Dict, List, Optional
+
+from api import get_daq_class
+from api.exceptions import DeviceError, DeviceRunTimeError
+from api.structures import DAQADCChannel, DAQSampleRate, DAQVoltage
+from acquisition.metrics import ReaderMetrics
+from acquisition.ring_buffer import RingBuffer
+from acquisition.scheduler import PollScheduler
+
+logger = logging.getLogger(__name__)
+
+
+class DeviceReader(threading.Thread):
+    """
+    A thread that only drains the DAQ122 FIFO into per-channel ring buffers.
+
+    Everything else (storing, plotting, monitoring) reads from ``rings`` at its
+    own pace, so a slow consumer can never stall ``DAQ122_TryReadData``.
+
+    Ring indexes are device sample counters. If the driver counts the
+    samples it dropped (``DAQ122.dropped_samples``), the new ones are skipped
+    in the ring right before the block that followed them, so stored sample
+    times stay exact across the gap. The vendor library only reports how
+    many samples it buffers: a read that finds the buffer full means samples
+    were dropped, and it is counted in ``metrics.buffer_overflows``, but as
+    the number is unknown the ring indexes after it are not corrected.
+
+    Attributes:
+        channels (List[int]): One-based channel numbers to read.
+        rings (Dict[int, RingBuffer]): Ring buffer per channel number.
+        scheduler (PollScheduler): Decides when the device is polled.
+        metrics (ReaderMetrics): Read latency and failure counters.
+        ready (threading.Event): Set once collection started or the device failed.
+        started (float): ``time.time()`` when collection started, the epoch time of ring index 0.
+        error (DeviceError): Device error that stopped the thread, if any.
+    """
+
+    def __init__(
+        self,
+        channels: List[int],
+        voltage: DAQVoltage,
+        sample_rate: DAQSampleRate,
+        read_elements_count: int,
+        buffer_duration: float = 2.0,
+        timeout: int = 5000,
+        target_latency: float = 0.02,
+        daq_class=None,
+        rings: Optional[Dict[int, RingBuffer]] = None,
+        fifo_size: Optional[int] = None,
+    ):
+        """
+        Initializes the reader.
+
+        Parameters:
+            channels (List[int]): One-based channel numbers to read.
+            voltage (DAQVoltage): Input range.
+            sample_rate (DAQSampleRate): Sample rate per channel.
+            read_elements_count (int): Elements per request.
+            buffer_duration (float): Seconds of samples kept per channel ring.
+            timeout (int): Driver timeout in milliseconds.
+            target_latency (float): Longest time a sample may wait in the device FIFO, s.
+            daq_class: DAQ122 implementation, defaults to ``get_daq_class()``.
+            rings (Dict[int, RingBuffer]): Rings to fill, e.g. shared with other processes,
+                defaults to new rings of ``buffer_duration`` seconds.
+            fifo_size (int): Driver buffer size per channel, defaults to ``DAQ122.fifo_size``;
+                full buffers are not detected if it is unknown.
+        """
+        super().__init__(daemon=True)
+        self.channels = list(channels)
+        self.voltage = voltage
+        self.sample_rate = sample_rate
+        self.read_elements_count = read_elements_count
+        self.timeout = timeout
+        self.daq_class = daq_class or get_daq_class()
+        if rings is None:
+            capacity = max(int(sample_rate.value * buffer_duration), 2 * read_elements_count)
+            rings = {channel: RingBuffer(capacity) for channel in self.channels}
+        self.rings: Dict[int, RingBuffer] = rings
+        self.scheduler = PollScheduler(sample_rate.value, read_elements_count, target_latency)
+        self.metrics = ReaderMetrics(self.channels)
+        self.fifo_size = fifo_size
+        self.ready = threading.Event()
+        self.started = 0.0
+        self.error: Optional[DeviceError] = None
+        self._stop_event = threading.Event()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+
+    @property
+    def is_running(self) -> bool:
+        return self.is_alive() and not self._stop_event.is_set()
+
+    def run(self) -> None:
+        try:
+            with self.daq_class() as daq:
+                if not daq.is_connected():
+                    raise DeviceRunTimeError("Device connection failed.")
+                daq.configure_sampling_parameters(self.voltage, self.sample_rate)
+                daq.config_adc_channel(DAQADCChannel.AIN_ALL)
+                daq.start_collection()
+                self.started = time.time()
+                self.ready.set()
+                self._read_loop(daq)
+        except DeviceError as e:
+            logger.debug(f"Device reader stopped: {e}")
+            self.error = e
+        finally:
+            self._stop_event.set()
+            self.ready.set()
+
+    def _read_loop(self, daq) -> None:
+        channel_numbers = [channel - 1 for channel in self.channels]
+        rings = [self.rings[channel] for channel in self.channels]
+        scheduler = self.scheduler
+        metrics = self.metrics
+        fifo_size = self.fifo_size if self.fifo_size is not None else daq.fifo_size
+        dropped = [0] * len(rings)
+        scheduler.start()
+        while not self._stop_event.is_set():
+            for _ in range(scheduler.wait()):
+                if self._stop_event.is_set():
+                    break
+                started = time.perf_counter()
+                success, block = daq.read_block(channel_numbers, self.read_elements_count, self.timeout)
+                elapsed = time.perf_counter() - started
+                scheduler.record(elapsed, success.any())
+                metrics.record(elapsed, self.channels, success)
+                for row, ring in enumerate(rings):
+                    if success[row]:
+                        total = daq.dropped_samples(channel_numbers[row])
+                        if total is None:
+                            self._check_overflow(daq, row, fifo_size)
+                        elif total > dropped[row]:
+                            logger.debug(
+                                f"Channel {self.channels[row]}: device dropped {total - dropped[row]} samples"
+                            )
+                            ring.skip(total - dropped[row])
+                            dropped[row] = total
+                        ring.write(block[row])
+                if not success.any():
+                    break
+
+    def _check_overflow(self, daq, row: int, fifo_size: Optional[int]) -> None:
+        if fifo_size is None:
+            return
+        buffered = daq.buffered_samples(self.channels[row] - 1)
+        if buffered is None or buffered + self.read_elements_count < fifo_size:
+            return
+        channel = self.channels[row]
+        if not self.metrics.buffer_overflows[channel]:
+            logger.warning(f"Channel {channel}: driver buffer full, samples dropped, later sample times are late")
+        self.metrics.buffer_overflows[channel] += 1
@@ -0,0 +1,156 @@
+from typing import Optional, Tuple
+
+import numpy as np
+
+
+class RingBuffer:
+    """
+    A single-producer circular buffer of samples with a monotonically increasing write index.
+
+    The producer never blocks and never waits for consumers: every consumer keeps
+    its own read cursor (an absolute sample index) and reads at its own pace.
+    If a consumer falls more than ``capacity`` samples behind, the oldest samples
+    are overwritten and the consumer is moved forward past them.
+
+    Samples the producer knows were lost before reaching it are accounted for
+    with ``skip``: the write index advances without writing and the skipped
+    range is kept in a small gap table, so reads stop before it and resume
+    after it, and the indexes stay device sample counters.
+
+    Attributes:
+        capacity (int): Number of samples kept in the buffer.
+        write_index (int): Total number of samples ever written or skipped.
+    """
+
+    max_gaps = 16
+
+    def __init__(self, capacity: int, dtype=np.float64):
+        """
+        Initializes the ring buffer.
+
+        Parameters:
+            capacity (int): Number of samples kept in the buffer.
+            dtype: NumPy dtype of the stored samples.
+        """
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self._data = np.zeros(capacity, dtype=dtype)
+        # Index the producer is writing up to; published before the copy so
+        # readers can tell whether their slots were overwritten meanwhile.
+        self._claimed_index = 0
+        self.write_index = 0
+        # Start and stop index of the latest skipped ranges, slot ``n % max_gaps`` holds gap ``n``.
+        self._gaps = np.zeros((self.max_gaps, 2), dtype=np.int64)
+        self._gap_count = 0
+
+    def __len__(self) -> int:
+        return min(self.write_index, self.capacity)
+
+    @property
+    def oldest_index(self) -> int:
+        return max(0, self.write_index - self.capacity)
+
+    def write(self, samples: np.ndarray) -> None:
+        count = len(samples)
+        if not count:
+            return
+        end_index = self.write_index + count
+        if count > self.capacity:
+            samples = samples[-self.capacity :]
+        self._claimed_index = end_index
+        start = (end_index - len(samples)) % self.capacity
+        first = min(len(samples), self.capacity - start)
+        self._data[start : start + first] = samples[:first]
+        if first < len(samples):
+            self._data[: len(samples) - first] = samples[first:]
+        self.write_index = end_index
+
+    def skip(self, count: int) -> None:
+        """Advances the write index past ``count`` samples that were lost before reaching the buffer."""
+        if count <= 0:
+            return
+        self._gaps[self._gap_count % self.max_gaps] = (self.write_index, self.write_index + count)
+        self._gap_count += 1
+        self._claimed_index = self.write_index + count
+        self.write_index += count
+
+    def _recent_gaps(self) -> np.ndarray:
+        count = self._gap_count
+        if count <= self.max_gaps:
+            return self._gaps[:count].copy()
+        return np.roll(self._gaps, -(count % self.max_gaps), axis=0)
+
+    def skipped(self, start: int, stop: int) -> int:
+        """Returns the number of skipped samples in ``[start, stop)``, as far as the gap table reaches."""
+        gaps = self._recent_gaps()
+        if not len(gaps):
+            return 0
+        return int(np.clip(np.minimum(gaps[:, 1], stop) - np.maximum(gaps[:, 0], start), 0, None).sum())
+
+    def next_gap(self, since: int) -> Optional[Tuple[int, int]]:
+        """Returns the start and stop index of the first skipped range ending after ``since``, if any."""
+        for gap_start, gap_stop in self._recent_gaps().tolist():
+            if gap_stop > since:
+                return gap_start, gap_stop
+        return None
+
+    def read(self, since: int, max_count: Optional[int] = None) -> Tuple[int, np.ndarray]:
+        """
+        Copies the samples written since the given absolute index.
+
+        Parameters:
+            since (int): Absolute index of the first wanted sample.
+            max_count (int): Upper bound on the number of returned samples.
+
+        Returns:
+            tuple: Absolute index of the first returned sample and the samples.
+            The index is greater than ``since`` if samples were overwritten
+            before they could be read or skipped; samples after a skipped
+            range are returned by the next call.
+        """
+        write_index = self.write_index
+        start_index = max(since, write_index - self.capacity, 0)
+        stop_index = write_index
+        if self._gap_count:
+            for gap_start, gap_stop in self._recent_gaps().tolist():
+                if gap_stop <= start_index:
+                    continue
+                if gap_start <= start_index:
+                    start_index = gap_stop
+                else:
+                    stop_index = min(stop_index, gap_start)
+                    break
+        if max_count is not None:
+            stop_index = min(stop_index, start_index + max_count)
+        if stop_index <= start_index:
+            return start_index, self._data[:0].copy()
+
+        start = start_index % self.capacity
+        count = stop_index - start_index
+        first = min(count, self.capacity - start)
+        if first == count:
+            samples = self._data[start : start + count].copy()
+        else:
+            samples = np.concatenate((self._data[start:], self._data[: count - first]))
+
+        overwritten_index = self._claimed_index - self.capacity
+        if overwritten_index > start_index:
+            skip = min(overwritten_index - start_index, count)
+            samples = samples[skip:]
+            start_index += skip
+        return start_index, samples
+
+    def read_blocks(self, since: int, block_size: int) -> Tuple[int, np.ndarray]:
+        """
+        Copies only whole blocks written since the given absolute index.
+
+        Returns:
+            tuple: Absolute index of the first returned sample and a
+            (blocks x block_size) array. The cursor of the caller should
+            advance to ``index + array.size``.
+        """
+        available = max(self.write_index - max(since, self.oldest_index), 0)
+        index, samples = self.read(since, max_count=available // block_size * block_size)
+        blocks = len(samples) // block_size
+        return index, samples[: blocks * block_size].reshape(blocks, block_size)
@@ -0,0 +1,88 @@
+import time
+
+
+class PollScheduler:
+    """
+    Decides when the device should be polled from the sample clock instead of a fixed sleep.
+
+    Blocks become available every ``read_elements_count / sample_rate`` seconds.
+    The scheduler sleeps until ``target_latency`` worth of blocks is due, then
+    lets the reader drain the whole backlog in one burst. Measured read times
+    and TryReadData timeouts keep its estimate of the device clock in sync.
+
+    Attributes:
+        block_period (float): Seconds needed by the device to fill one EpR block.
+        target_latency (float): Longest time a sample may wait in the device FIFO.
+        blocks_per_wake (int): Blocks read per wake-up when the reader keeps up.
+        read_time (float): Smoothed duration of a successful block read.
+        blocks_read (int): Successfully read blocks.
+        timeouts (int): Failed (timed out) block reads.
+    """
+
+    smoothing = 0.1
+    min_sleep = 0.0005
+
+    def __init__(self, sample_rate: int, read_elements_count: int, target_latency: float = 0.02):
+        """
+        Initializes the scheduler.
+
+        Parameters:
+            sample_rate (int): Sample rate per channel, Hz.
+            read_elements_count (int): Elements per request.
+            target_latency (float): Longest time a sample may wait in the device FIFO, s.
+        """
+        self.block_period = read_elements_count / sample_rate
+        self.target_latency = max(target_latency, self.block_period)
+        self.blocks_per_wake = max(1, int(self.target_latency / self.block_period))
+        self.read_time = 0.0
+        self.blocks_read = 0
+        self.timeouts = 0
+        self.start_time = None
+
+    def start(self) -> None:
+        self.start_time = time.perf_counter()
+
+    def backlog(self, now: float = None) -> int:
+        """Number of blocks the device should have ready that were not read yet."""
+        if now is None:
+            now = time.perf_counter()
+        return int((now - self.start_time) / self.block_period) - self.blocks_read
+
+    def wait(self) -> int:
+        """
+        Sleeps until the next batch of blocks is due.
+
+        Returns:
+            int: Number of blocks to read before calling ``wait`` again.
+        """
+        now = time.perf_counter()
+        backlog = self.backlog(now)
+        if backlog >= self.blocks_per_wake:
+            return backlog
+        deadline = self.start_time + (self.blocks_read + self.blocks_per_wake) * self.block_period
+        if deadline - now > self.min_sleep:
+            time.sleep(deadline - now)
+        return max(1, self.backlog())
+
+    def record(self, elapsed: float, success: bool) -> None:
+        """
+        Feeds the outcome of one block read back into the clock estimate.
+
+        Parameters:
+            elapsed (float): Time spent in the read, s.
+            success (bool): Whether the driver returned data.
+        """
+        if not success:
+            # The device has nothing buffered: restart the clock from now.
+            self.timeouts += 1
+            self.start_time = time.perf_counter() - self.blocks_read * self.block_period
+            return
+        self.blocks_read += 1
+        if self.blocks_read == 1:
+            self.read_time = elapsed
+            return
+        if elapsed > max(2 * self.read_time, self.block_period / 2):
+            # The driver waited for the block, so the device clock runs behind ours.
+            self.start_time += elapsed - self.read_time
+            return
+        self.read_time += self.smoothing * (elapsed - self.read_time)
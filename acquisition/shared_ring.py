@@ -0,0 +1,117 @@
+import threading
+from multiprocessing import shared_memory
+from typing import Dict, Optional
+
+import numpy as np
+
+from acquisition.ring_buffer import RingBuffer
+
+
+class SharedRingBuffer(RingBuffer):
+    """
+    A RingBuffer whose samples and indexes live in a shared memory block.
+
+    The producer process writes exactly as to a RingBuffer; consumer processes
+    attach by name and read with their own cursors, and the overwrite check
+    of ``read`` detects consumers that fell more than ``capacity`` behind.
+
+    Layout: an int64 header ``[write_index, claimed_index, finished, gap_count]``
+    and ``max_gaps`` ``[start, stop]`` gap pairs, followed by ``capacity`` float64 samples.
+
+    Attributes:
+        name (str): Shared memory block name, pass it to ``attach``.
+    """
+
+    header_size = 4 + 2 * RingBuffer.max_gaps
+
+    def __init__(self, capacity: int, name: Optional[str] = None, create: bool = True):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self._shm = shared_memory.SharedMemory(name=name, create=create, size=8 * (self.header_size + capacity))
+        self.name = self._shm.name
+        self._header = np.ndarray((self.header_size,), dtype=np.int64, buffer=self._shm.buf)
+        self._gaps = self._header[4:].reshape(self.max_gaps, 2)
+        self._data = np.ndarray((capacity,), dtype=np.float64, buffer=self._shm.buf, offset=8 * self.header_size)
+        if create:
+            self._header[:] = 0
+
+    @classmethod
+    def attach(cls, name: str, capacity: int) -> "SharedRingBuffer":
+        return cls(capacity, name=name, create=False)
+
+    @property
+    def write_index(self) -> int:
+        return int(self._header[0])
+
+    @write_index.setter
+    def write_index(self, value: int) -> None:
+        self._header[0] = value
+
+    @property
+    def _claimed_index(self) -> int:
+        return int(self._header[1])
+
+    @_claimed_index.setter
+    def _claimed_index(self, value: int) -> None:
+        self._header[1] = value
+
+    @property
+    def _gap_count(self) -> int:
+        return int(self._header[3])
+
+    @_gap_count.setter
+    def _gap_count(self, value: int) -> None:
+        self._header[3] = value
+
+    @property
+    def is_finished(self) -> bool:
+        return bool(self._header[2])
+
+    def finish(self) -> None:
+        """Tells consumers that the producer will not write anymore."""
+        self._header[2] = 1
+
+    def close(self) -> None:
+        del self._header, self._gaps, self._data
+        self._shm.close()
+
+    def unlink(self) -> None:
+        self._shm.unlink()
+
+
+class SharedRingReader:
+    """
+    Consumer side stand-in for a DeviceReader over rings filled by another process.
+
+    It lets an AcquisitionEngine run in a consumer process: the engine polls
+    the shared rings as usual and stops once the producer finished them.
+
+    Attributes:
+        rings (Dict[int, SharedRingBuffer]): Attached rings by channel number.
+        ready (threading.Event): Always set once started.
+        started (float): ``time.time()`` when the producer started collection.
+        error: Always None, the producer process reports device errors.
+        metrics: Always None, read counters live in the producer process.
+    """
+
+    def __init__(self, rings: Dict[int, SharedRingBuffer], started: float = 0.0):
+        self.rings = rings
+        self.started = started
+        self.ready = threading.Event()
+        self.error = None
+        self.metrics = None
+        self._stopped = False
+
+    def start(self) -> None:
+        self.ready.set()
+
+    def stop(self) -> None:
+        self._stopped = True
+
+    def join(self) -> None:
+        pass
+
+    @property
+    def is_running(self) -> bool:
+        return not self._stopped and not all(ring.is_finished for ring in self.rings.values())
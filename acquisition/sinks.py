@@ -0,0 +1,215 @@
+import json
+import logging
+import socket
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from acquisition.decimation import DecimationFilter, Decimator
+from acquisition.engine import Sink
+from acquisition.frame import Frame
+from acquisition.frame_buffer import FrameBuffer
+from acquisition.statistics import StatisticsEngine
+from acquisition.timebase import Timebase
+from store.channel_store import ChannelStore
+from store.recorder import HDF5Recorder
+
+logger = logging.getLogger(__name__)
+
+
+class StoreSink(Sink):
+    """
+    Appends raw or decimated samples to an in-memory ChannelStore and keeps its ``timebases`` up to date.
+
+    Attributes:
+        store (ChannelStore): Destination store.
+        decimation (int): Raw samples per stored point, 1 to store raw samples.
+        kind (DecimationFilter): Anti-aliasing filter of the decimation.
+    """
+
+    def __init__(self, store: ChannelStore, decimation: int = 1, kind: DecimationFilter = DecimationFilter.FIR):
+        self.store = store
+        self.decimation = decimation
+        self.kind = kind
+        self._decimators: Dict[int, Decimator] = {}
+
+    def open(self, engine) -> None:
+        for channel in self.store:
+            self.store.timebases[channel] = engine.timebase(self.decimation)
+        if self.decimation > 1:
+            self._decimators = {channel: Decimator(self.decimation, self.kind) for channel in self.store}
+
+    def write(self, channel: int, index: int, blocks: np.ndarray, means: np.ndarray) -> None:
+        decimator = self._decimators.get(channel)
+        self.store[channel].extend(blocks.ravel() if decimator is None else decimator.process(blocks.ravel(), index))
+        timebase = self.store.timebases.get(channel)
+        if timebase is not None:
+            timebase.append(index, blocks.size)
+
+    def close(self) -> None:
+        for channel, decimator in self._decimators.items():
+            self.store[channel].extend(decimator.flush())
+
+    def metrics(self) -> Dict[str, Any]:
+        return {"stored_bytes": self.store.nbytes, "resident_bytes": self.store.resident_nbytes}
+
+
+class RecorderSink(Sink):
+    """
+    Streams raw or decimated samples to an open HDF5Recorder.
+
+    Without ``flush_interval`` every batch is appended right away. With it,
+    batches are collected for ``flush_interval`` seconds and then appended
+    with one resize per channel and flushed to disk, so resident memory
+    stays bounded by the interval and a crash loses at most one interval.
+    The recorder is flushed on close but stays open, so its owner can write
+    the final attributes with ``HDF5Recorder.close``; the timebase of every
+    channel is written to its dataset attributes on close.
+
+    Attributes:
+        recorder (HDF5Recorder): Destination recorder.
+        decimation (int): Raw samples per recorded point, 1 to record raw samples.
+        kind (DecimationFilter): Anti-aliasing filter of the decimation.
+        stream (str): Stream of the recorder to write, None for ``data``.
+        flush_interval (float): Seconds between writes, None to write every batch.
+        timebases (Dict[int, Timebase]): Timebase of every recorded channel, set on open.
+    """
+
+    def __init__(
+        self,
+        recorder: HDF5Recorder,
+        decimation: int = 1,
+        kind: DecimationFilter = DecimationFilter.FIR,
+        stream: Optional[str] = None,
+        flush_interval: Optional[float] = None,
+    ):
+        self.recorder = recorder
+        self.decimation = decimation
+        self.kind = kind
+        self.stream = stream
+        self.flush_interval = flush_interval
+        self.timebases: Dict[int, Timebase] = {}
+        self._decimators: Dict[int, Decimator] = {}
+        self._pending: Dict[int, List[np.ndarray]] = {channel: [] for channel in recorder.channels}
+        self._flushed = time.monotonic()
+
+    def open(self, engine) -> None:
+        self.timebases = {channel: engine.timebase(self.decimation) for channel in self.recorder.channels}
+        if self.decimation > 1:
+            self._decimators = {channel: Decimator(self.decimation, self.kind) for channel in self.recorder.channels}
+
+    def write(self, channel: int, index: int, blocks: np.ndarray, means: np.ndarray) -> None:
+        if channel in self.timebases:
+            self.timebases[channel].append(index, blocks.size)
+        decimator = self._decimators.get(channel)
+        self.append(channel, blocks.ravel() if decimator is None else decimator.process(blocks.ravel(), index))
+
+    def append(self, channel: int, samples: np.ndarray) -> None:
+        if self.flush_interval is None:
+            self.recorder.append(channel, samples, self.stream)
+        else:
+            self._pending[channel].append(samples)
+
+    def frame(self, frame: Frame) -> None:
+        if self.flush_interval is not None and time.monotonic() - self._flushed >= self.flush_interval:
+            self.flush()
+
+    def flush(self) -> None:
+        for channel, pending in self._pending.items():
+            if pending:
+                self.recorder.append(channel, np.concatenate(pending), self.stream)
+                pending.clear()
+        self.recorder.flush()
+        self._flushed = time.monotonic()
+
+    def close(self) -> None:
+        for channel, decimator in self._decimators.items():
+            self.append(channel, decimator.flush())
+        self.flush()
+        for channel, timebase in self.timebases.items():
+            self.recorder.set_timebase(channel, timebase, self.stream)
+
+    def metrics(self) -> Dict[str, Any]:
+        return {"recorder_pending_samples": sum(sum(map(len, pending)) for pending in self._pending.values())}
+
+
+class StatisticsSink(Sink):
+    """Feeds every raw block to a StatisticsEngine."""
+
+    def __init__(self, statistics: StatisticsEngine):
+        self.statistics = statistics
+
+    def write(self, channel: int, index: int, blocks: np.ndarray, means: np.ndarray) -> None:
+        self.statistics.update(channel, blocks)
+
+
+class FrameSink(Sink):
+    """Pushes frames to a FrameBuffer for a display running at its own rate."""
+
+    def __init__(self, frames: FrameBuffer):
+        self.frames = frames
+
+    def frame(self, frame: Frame) -> None:
+        self.frames.push(frame)
+
+    def metrics(self) -> Dict[str, Any]:
+        return {"frame_backlog": len(self.frames)}
+
+
+class SocketSink(Sink):
+    """
+    Sends every frame as a UDP datagram of little-endian float64 values.
+
+    The datagram holds the time, the channel numbers and the channel values:
+    ``[time, channel_1, ..., channel_n, value_1, ..., value_n]``. Frames that
+    cannot be sent right away are dropped instead of blocking acquisition.
+
+    Attributes:
+        address (Tuple[str, int]): Destination host and port.
+    """
+
+    def __init__(self, address: Tuple[str, int]):
+        self.address = address
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.socket.setblocking(False)
+
+    def frame(self, frame: Frame) -> None:
+        payload = np.concatenate(([frame.time], frame.channels, frame.values)).astype("<f8")
+        try:
+            self.socket.sendto(payload.tobytes(), self.address)
+        except OSError as e:
+            logger.debug(f"Frame dropped: {e}")
+
+    def close(self) -> None:
+        self.socket.close()
+
+
+class MetricsLog(Sink):
+    """
+    Appends a JSON line with ``AcquisitionEngine.metrics()`` to a file every ``interval`` seconds.
+
+    Attributes:
+        filepath (str): Output JSON-lines file.
+        interval (float): Seconds between lines.
+    """
+
+    def __init__(self, engine, filepath: str, interval: float = 1.0):
+        self.engine = engine
+        self.filepath = filepath
+        self.interval = interval
+        self._file = open(filepath, "a")
+        self._written = 0.0
+
+    def frame(self, frame: Frame) -> None:
+        if frame.time - self._written >= self.interval:
+            self._written = frame.time
+            self.write_line()
+
+    def write_line(self) -> None:
+        self._file.write(json.dumps({"time": time.time(), **self.engine.metrics()}) + "\n")
+        self._file.flush()
+
+    def close(self) -> None:
+        self.write_line()
+        self._file.close()
@@ -0,0 +1,140 @@
+import threading
+from enum import Enum
+from typing import Dict, Iterable
+
+import numpy as np
+
+from api.structures import EnumMixin
+
+
+class StatisticsWindow(EnumMixin, Enum):
+    Cumulative = "Cumulative"
+    Exponential = "Exponential"
+    Sliding = "Sliding"
+
+
+class StreamingStatistics:
+    """
+    Running mean, min, max, RMS and standard deviation of one channel.
+
+    Every block is reduced to a summary (count, mean, M2, min, max) with a
+    fixed number of NumPy calls and merged with the Chan et al. parallel
+    variance formula, so the Python cost per block does not depend on its size.
+
+    Windows:
+        Cumulative: everything since the measurement started.
+        Exponential: blocks are weighted by ``alpha * (1 - alpha) ** age``.
+        Sliding: the last ``length`` blocks, summaries kept in NumPy arrays.
+    """
+
+    __slots__ = ("window", "alpha", "length", "count", "mean", "m2", "min", "max", "_blocks", "_index")
+
+    def __init__(self, window: StatisticsWindow = StatisticsWindow.Cumulative, length: int = 100, alpha: float = 0.1):
+        self.window = window
+        self.alpha = alpha
+        self.length = length
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+        # count, mean, m2, min, max of the last ``length`` blocks
+        self._blocks = np.zeros((5, length)) if window == StatisticsWindow.Sliding else None
+        self._index = 0
+
+    def update(self, samples: np.ndarray) -> None:
+        count = samples.size
+        if not count:
+            return
+        mean = float(samples.mean())
+        m2 = float(samples.var()) * count
+        minimum = float(samples.min())
+        maximum = float(samples.max())
+
+        if self.window == StatisticsWindow.Sliding:
+            self._blocks[:, self._index % self.length] = (count, mean, m2, minimum, maximum)
+            self._index += 1
+            self._merge_blocks()
+            return
+
+        if self.window == StatisticsWindow.Exponential and self.count:
+            # Treat the history as (1 - alpha) / alpha times as heavy as the new block.
+            weight = count * (1 - self.alpha) / self.alpha
+            self.m2 *= weight / self.count
+            self.count = weight
+            # Extremes follow new ones immediately and decay towards the block ones.
+            self.min = min(minimum, self.min + self.alpha * (minimum - self.min))
+            self.max = max(maximum, self.max + self.alpha * (maximum - self.max))
+        else:
+            self.min = min(self.min, minimum)
+            self.max = max(self.max, maximum)
+
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self.m2 += m2 + delta * delta * self.count * count / total
+        self.count = total
+
+    def _merge_blocks(self) -> None:
+        blocks = self._blocks[:, : min(self._index, self.length)]
+        counts, means, m2s = blocks[0], blocks[1], blocks[2]
+        self.count = counts.sum()
+        self.mean = float((counts * means).sum() / self.count)
+        self.m2 = float(m2s.sum() + (counts * (means - self.mean) ** 2).sum())
+        self.min = float(blocks[3].min())
+        self.max = float(blocks[4].max())
+
+    @property
+    def std(self) -> float:
+        return float(np.sqrt(self.m2 / self.count)) if self.count else np.nan
+
+    @property
+    def rms(self) -> float:
+        if not self.count:
+            return np.nan
+        return float(np.sqrt(self.mean**2 + self.m2 / self.count))
+
+    def summary(self) -> Dict[str, float]:
+        if not self.count:
+            return {"count": 0, "mean": np.nan, "min": np.nan, "max": np.nan, "rms": np.nan, "std": np.nan}
+        return {
+            "count": int(self.count),
+            "mean": self.mean,
+            "min": self.min,
+            "max": self.max,
+            "rms": self.rms,
+            "std": self.std,
+        }
+
+
+class StatisticsEngine:
+    """
+    Streaming statistics of several channels, safe to query from another thread.
+
+    Attributes:
+        channels (Dict[int, StreamingStatistics]): Statistics by channel number.
+    """
+
+    def __init__(
+        self,
+        channels: Iterable[int],
+        window: StatisticsWindow = StatisticsWindow.Cumulative,
+        length: int = 100,
+        alpha: float = 0.1,
+    ):
+        self._lock = threading.Lock()
+        self.channels: Dict[int, StreamingStatistics] = {
+            channel: StreamingStatistics(window, length, alpha) for channel in channels
+        }
+
+    def update(self, channel: int, samples: np.ndarray) -> None:
+        with self._lock:
+            self.channels[channel].update(samples)
+
+    def summary(self, channel: int) -> Dict[str, float]:
+        with self._lock:
+            return self.channels[channel].summary()
+
+    def summaries(self) -> Dict[int, Dict[str, float]]:
+        with self._lock:
+            return {channel: statistics.summary() for channel, statistics in self.channels.items()}
@@ -0,0 +1,89 @@
+import time
+from multiprocessing import shared_memory
+from typing import Optional, Tuple
+
+import numpy as np
+
+
+class StatusBoard:
+    """
+    Latest per-channel status in a fixed-size shared memory block.
+
+    One process writes the whole table with a sequence lock: the sequence
+    number is odd while a write is in progress and is bumped to the next even
+    number when it is complete. Readers in other processes copy the table and
+    retry if the sequence was odd or changed meanwhile, so neither side ever
+    blocks and nothing is pickled. A reader polling at its own rate always
+    sees the newest complete table, never a backlog.
+
+    Layout: an int64 header ``[sequence, finished]`` followed by a float64
+    table of ``channels x len(fields)`` values.
+
+    Attributes:
+        name (str): Shared memory block name, pass it to ``attach``.
+        channels (int): Table rows.
+    """
+
+    fields = ("time", "last", "count", "lost", "mean", "min", "max", "rms", "std")
+    header_size = 2
+
+    def __init__(self, channels: int, name: Optional[str] = None, create: bool = True):
+        self.channels = channels
+        size = 8 * (self.header_size + channels * len(self.fields))
+        self._shm = shared_memory.SharedMemory(name=name, create=create, size=size)
+        self.name = self._shm.name
+        self._header = np.ndarray((self.header_size,), dtype=np.int64, buffer=self._shm.buf)
+        self._table = np.ndarray(
+            (channels, len(self.fields)), dtype=np.float64, buffer=self._shm.buf, offset=8 * self.header_size
+        )
+        if create:
+            self._header[:] = 0
+            self._table[:] = np.nan
+
+    @classmethod
+    def attach(cls, name: str, channels: int) -> "StatusBoard":
+        return cls(channels, name=name, create=False)
+
+    @property
+    def sequence(self) -> int:
+        return int(self._header[0])
+
+    @property
+    def is_finished(self) -> bool:
+        return bool(self._header[1])
+
+    def write(self, table: np.ndarray) -> None:
+        """
+        Publishes a complete table, one row per channel in ``fields`` order.
+        """
+        self._header[0] += 1
+        self._table[:] = table
+        self._header[0] += 1
+
+    def read(self, retries: int = 100) -> Optional[Tuple[int, np.ndarray]]:
+        """
+        Copies a consistent table.
+
+        Returns:
+            tuple: Sequence number and table copy, or None if every attempt overlapped a write.
+        """
+        for _ in range(retries):
+            before = int(self._header[0])
+            if before & 1:
+                time.sleep(0)
+                continue
+            table = self._table.copy()
+            if int(self._header[0]) == before:
+                return before, table
+        return None
+
+    def finish(self) -> None:
+        """Tells readers that no more tables will be written."""
+        self._header[1] = 1
+
+    def close(self) -> None:
+        del self._header, self._table
+        self._shm.close()
+
+    def unlink(self) -> None:
+        self._shm.unlink()
@@ -0,0 +1,134 @@
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+segment_columns = ("index", "source_index", "missing")
+
+
+class Timebase:
+    """
+    Sample times of a stored stream derived from sample counters instead of clocks.
+
+    Only the start time, the sample rate and one ``(stored_index, source_index)``
+    pair per contiguous segment are kept. ``source_index`` is the device sample
+    counter of the first raw sample of the segment, so the time of any stored
+    point is computed on demand and never drifts with scheduling jitter. A new
+    segment starts whenever samples between two appended batches are missing.
+
+    Attributes:
+        start (float): Epoch time of device sample 0, s.
+        sample_rate (float): Device sample rate per channel, Hz.
+        decimation (int): Raw samples per stored point, e.g. EpR for block means.
+        segments (List[Tuple[int, int]]): Stored index and source index of every segment.
+        counts (List[int]): Raw samples of every segment, including those a
+            partial stored point was not made of.
+        size (int): Stored points so far.
+    """
+
+    __slots__ = ("start", "sample_rate", "decimation", "segments", "counts", "size", "_next_source")
+
+    def __init__(self, start: float, sample_rate: float, decimation: int = 1):
+        self.start = start
+        self.sample_rate = sample_rate
+        self.decimation = decimation
+        self.segments: List[Tuple[int, int]] = []
+        self.counts: List[int] = []
+        self.size = 0
+        self._next_source: Optional[int] = None
+
+    def append(self, source_index: int, count: int) -> None:
+        """
+        Accounts for ``count`` raw samples starting at device sample ``source_index``.
+        """
+        if source_index != self._next_source:
+            self.segments.append((self.size, source_index))
+            self.counts.append(0)
+        self._next_source = source_index + count
+        self.counts[-1] += count
+        self.size = self.segments[-1][0] + self.counts[-1] // self.decimation
+
+    @property
+    def period(self) -> float:
+        return self.decimation / self.sample_rate
+
+    @property
+    def gaps(self) -> List[Tuple[int, int]]:
+        """Stored index and number of missing raw samples before every segment but the first."""
+        gaps = []
+        for (_, previous_source), previous_count, (index, source) in zip(
+            self.segments, self.counts, self.segments[1:]
+        ):
+            gaps.append((index, source - previous_source - previous_count))
+        return gaps
+
+    def times(self, start: int = 0, stop: Optional[int] = None, absolute: bool = False) -> np.ndarray:
+        """
+        Computes times of stored points.
+
+        Parameters:
+            start (int): First stored index.
+            stop (int): Stored index after the last one, defaults to ``size``.
+            absolute (bool): Epoch times instead of seconds since device sample 0.
+
+        Returns:
+            np.ndarray: Time of every stored point in ``[start, stop)``, at the
+            center of the raw samples it was made of.
+        """
+        stop = self.size if stop is None else stop
+        indexes = np.arange(start, stop)
+        segments = np.asarray(self.segments or [(0, 0)], dtype=np.int64)
+        segment = np.searchsorted(segments[:, 0], indexes, side="right") - 1
+        source = segments[segment, 1] + (indexes - segments[segment, 0]) * self.decimation
+        times = (source + (self.decimation - 1) / 2) / self.sample_rate
+        return times + self.start if absolute else times
+
+    @property
+    def missing(self) -> int:
+        """Raw samples missing between the first and the last stored point."""
+        return sum(count for _, count in self.gaps)
+
+    def to_attrs(self) -> Dict[str, Any]:
+        """Returns HDF5 attributes describing the timebase, the segments are saved by ``segment_table``."""
+        return {"start_time": self.start, "sample_rate": self.sample_rate, "decimation": self.decimation}
+
+    def segment_table(self) -> np.ndarray:
+        """
+        Returns the segments as an int64 ``(segments, 3)`` table.
+
+        Columns are the stored index of the first point, the device sample
+        index of its first raw sample and the raw samples missing before it.
+        """
+        table = np.zeros((len(self.segments), len(segment_columns)), dtype=np.int64)
+        if self.segments:
+            table[:, :2] = self.segments
+            table[0, 2] = self.segments[0][1]
+            table[1:, 2] = [count for _, count in self.gaps]
+        return table
+
+    @classmethod
+    def from_attrs(cls, attrs, segments=None, size: int = 0) -> Optional["Timebase"]:
+        """
+        Restores a timebase saved by ``to_attrs`` and ``segment_table``.
+
+        Parameters:
+            attrs: Attributes returned by ``to_attrs``.
+            segments: Table returned by ``segment_table``, None if there is none.
+            size (int): Stored points.
+
+        Returns:
+            Timebase: The timebase, or None if the attributes do not hold one.
+        """
+        if "start_time" not in attrs:
+            return None
+        timebase = cls(float(attrs["start_time"]), float(attrs["sample_rate"]), int(attrs["decimation"]))
+        if segments is not None:
+            timebase.segments = [(int(index), int(source)) for index, source, _ in np.asarray(segments)]
+            # A segment ends where the missing samples before the next one start.
+            table = np.asarray(segments, dtype=np.int64)
+            timebase.counts = [int(count) for count in table[1:, 1] - table[1:, 2] - table[:-1, 1]]
+        timebase.size = size
+        if timebase.segments:
+            index, source = timebase.segments[-1]
+            timebase.counts.append((size - index) * timebase.decimation)
+            timebase._next_source = source + timebase.counts[-1]
+        return timebase
@@ -0,0 +1,128 @@
+from enum import Enum
+from typing import Optional
+
+import numpy as np
+
+from acquisition.ring_buffer import RingBuffer
+from api.structures import EnumMixin
+
+
+class TriggerSlope(EnumMixin, Enum):
+    Rising = "Rising"
+    Falling = "Falling"
+
+
+class TriggerMode(EnumMixin, Enum):
+    Auto = "Auto"
+    Normal = "Normal"
+    Single = "Single"
+
+
+def find_edges(samples: np.ndarray, level: float, slope: TriggerSlope) -> np.ndarray:
+    """
+    Finds level crossings in one vectorized pass.
+
+    Returns:
+        np.ndarray: Indexes ``i`` such that the signal crosses ``level`` between
+        ``samples[i - 1]`` and ``samples[i]`` in the direction of ``slope``.
+    """
+    above = samples >= level
+    if slope == TriggerSlope.Rising:
+        crossings = ~above[:-1] & above[1:]
+    else:
+        crossings = above[:-1] & ~above[1:]
+    return np.flatnonzero(crossings) + 1
+
+
+class EdgeTrigger:
+    """
+    An oscilloscope edge trigger working on absolute sample indexes of a RingBuffer.
+
+    The ring buffer itself holds the pre-trigger samples, so a sweep is just
+    the index range ``[trigger - pre, trigger + post)`` and is read from the
+    rings of all channels once the post-trigger samples arrived.
+
+    Attributes:
+        level (float): Trigger level, V.
+        slope (TriggerSlope): Edge direction.
+        mode (TriggerMode): Auto free-runs without edges, Normal waits for edges,
+            Single captures one sweep and disarms.
+        record_length (int): Samples per sweep.
+        pre_trigger (float): Fraction of the sweep before the trigger point.
+        armed (bool): Whether the trigger looks for edges.
+    """
+
+    def __init__(
+        self,
+        level: float = 0.0,
+        slope: TriggerSlope = TriggerSlope.Rising,
+        mode: TriggerMode = TriggerMode.Auto,
+        record_length: int = 1000,
+        pre_trigger: float = 0.1,
+    ):
+        self.level = level
+        self.slope = slope
+        self.mode = mode
+        self.record_length = record_length
+        self.pre_trigger = min(max(pre_trigger, 0.0), 1.0)
+        self.armed = True
+        self._cursor = 0
+        self._pending: Optional[int] = None
+        self._last_trigger: Optional[int] = None
+        self._last_sweep = 0
+
+    @property
+    def pre_count(self) -> int:
+        return int(self.record_length * self.pre_trigger)
+
+    @property
+    def post_count(self) -> int:
+        return self.record_length - self.pre_count
+
+    def arm(self) -> None:
+        self.armed = True
+        self._pending = None
+
+    def poll(self, ring: RingBuffer) -> Optional[int]:
+        """
+        Searches the samples written since the last poll for a trigger.
+
+        Parameters:
+            ring (RingBuffer): Ring of the trigger channel.
+
+        Returns:
+            int: Absolute index of the first sample of a complete sweep, or None.
+        """
+        write_index = ring.write_index
+        if self.armed and self._pending is None:
+            self._pending = self._search(ring)
+        if self._pending is not None:
+            if write_index < self._pending + self.post_count:
+                return None
+            start = self._pending - self.pre_count
+            self._last_trigger = self._pending
+            self._last_sweep = write_index
+            self._pending = None
+            if self.mode == TriggerMode.Single:
+                self.armed = False
+            return start
+        if self.mode == TriggerMode.Auto and write_index - self._last_sweep >= self.record_length:
+            self._last_sweep = write_index
+            return max(write_index - self.record_length, 0)
+        return None
+
+    def _search(self, ring: RingBuffer) -> Optional[int]:
+        # Re-read the last searched sample to catch crossings on block boundaries.
+        since = max(self._cursor - 1, ring.oldest_index)
+        if self._last_trigger is not None:
+            since = max(since, self._last_trigger + self.post_count)
+        index, samples = ring.read(since)
+        if len(samples):
+            self._cursor = index + len(samples)
+        if len(samples) < 2:
+            return None
+        edges = index + find_edges(samples, self.level, self.slope)
+        edges = edges[edges - self.pre_count >= ring.oldest_index]
+        if not len(edges):
+            return None
+        return int(edges[-1])
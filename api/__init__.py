@@ -3,9 +3,16 @@ import logging
 
 from .win_daq122 import WinDAQ122
 from .lin_daq122 import LinDAQ122
+from .sim_daq122 import SimDAQ122
 
 
 def get_daq_class():
+    """
+    Returns the DAQ122 implementation of the platform, or the simulated one if
+    the ``DAQ122_BACKEND`` environment variable is ``sim``.
+    """
+    if os.environ.get("DAQ122_BACKEND", "").lower() == "sim":
+        return SimDAQ122
     if os.name == "posix":
         return LinDAQ122
     return WinDAQ122
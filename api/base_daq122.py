@@ -1,5 +1,8 @@
 import ctypes
 import logging
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
 
 from api.exceptions import (
     DeviceInitializeError,
@@ -20,8 +23,12 @@ class DAQ122:
 
     Attributes:
         dll_path (str): The path to the DAQ122 DLL (SO).
+        fifo_size (int): Samples per channel the driver buffers before dropping, None if unknown.
     """
 
+    # channel_data_buffer_size_ of libdaq.
+    fifo_size: Optional[int] = 10 * 1024 * 1024
+
     def __init__(self, dll_path: str = None):
         """
         Initializes the DAQ122 device interface.
@@ -31,17 +38,22 @@ class DAQ122:
         """
         if dll_path is None:
             dll_path = self._define_dll()
-        try:
-            self.dll = ctypes.CDLL(dll_path)
-        except OSError:
-            raise DllError("DLL or SO not found or incorrect!")
+        self.dll = self._load_dll(dll_path)
         self._setup_function_prototypes()
         self.obj = None
         self.sample_rate = None
+        self._buffers: Dict[int, np.ndarray] = {}
+        self._block_buffers: Dict[Tuple[int, ...], np.ndarray] = {}
 
     def _define_dll(self):
         raise NotImplementedError
 
+    def _load_dll(self, dll_path: str):
+        try:
+            return ctypes.CDLL(dll_path)
+        except OSError:
+            raise DllError("DLL or SO not found or incorrect!")
+
     def _setup_function_prototypes(self):
         raise NotImplementedError
 
@@ -109,10 +121,120 @@ class DAQ122:
             logger.debug("Failed to stop data collection.")
             raise DeviceRunTimeError("Failed to stop data collection.")
 
-    def read_data(self, read_elements_count: int = 100, channel_number: int = 0, timeout: int = 1000):
+    def get_buffer(self, read_elements_count: int, channel_number: int = 0) -> np.ndarray:
+        """
+        Returns the reusable per-channel read buffer, reallocating it only if EpR grows.
+
+        Parameters:
+            read_elements_count (int): Elements per request the buffer must hold.
+            channel_number (int): Zero-based channel index the buffer belongs to.
+        """
+        buffer = self._buffers.get(channel_number)
+        if buffer is None or buffer.shape[0] < read_elements_count:
+            buffer = np.empty(read_elements_count, dtype=np.float64)
+            self._buffers[channel_number] = buffer
+        return buffer
+
+    def read_into(
+        self, out: np.ndarray, channel_number: int = 0, read_elements_count: int = None, timeout: int = 1000
+    ) -> Tuple[bool, np.ndarray]:
+        """
+        Reads samples straight into a caller-supplied float64 array without intermediate copies.
+
+        Parameters:
+            out (np.ndarray): C-contiguous, writable float64 array to fill.
+            channel_number (int): Zero-based channel index.
+            read_elements_count (int): Samples to read, defaults to ``out.shape[0]``.
+            timeout (int): Driver timeout in milliseconds.
+
+        Returns:
+            tuple: Success flag and a view of ``out`` holding the read samples.
+        """
+        if read_elements_count is None:
+            read_elements_count = out.shape[0]
         if read_elements_count > self.sample_rate.value:
             logger.debug("read_elements_count must not be greater than sample_rate")
             raise DeviceReadElementsCountError("read_elements_count must not be greater than sample_rate")
-        data_buffer = (ctypes.c_double * self.sample_rate.value)()
-        label = self.dll.DAQ122_TryReadData(self.obj, channel_number, data_buffer, read_elements_count, timeout)
-        return label, data_buffer
+        if read_elements_count > out.shape[0]:
+            logger.debug("read_elements_count must not be greater than buffer size")
+            raise DeviceReadElementsCountError("read_elements_count must not be greater than buffer size")
+        if out.dtype != np.float64 or not out.flags.c_contiguous or not out.flags.writeable:
+            raise ValueError("Buffer must be a writable C-contiguous float64 array")
+        data_pointer = out.ctypes.data_as(ctypes.POINTER(ctypes.c_double))
+        label = self.dll.DAQ122_TryReadData(self.obj, channel_number, data_pointer, read_elements_count, timeout)
+        return bool(label), out[:read_elements_count]
+
+    def buffered_samples(self, channel_number: int = 0) -> Optional[int]:
+        """
+        Returns the samples waiting in the driver buffer of a channel.
+
+        Parameters:
+            channel_number (int): Zero-based channel index.
+
+        Returns:
+            int: Buffered samples, None if the loaded library does not export
+            ``DAQ122_GetADCBufferDataSize``.
+        """
+        function = getattr(self.dll, "DAQ122_GetADCBufferDataSize", None)
+        if function is None:
+            return None
+        return int(function(self.obj, channel_number))
+
+    def dropped_samples(self, channel_number: int = 0) -> Optional[int]:
+        """
+        Returns the samples of a channel the driver dropped since collection started.
+
+        Dropped samples precede every sample still buffered. The vendor
+        library does not count them, so this is None unless a backend does.
+
+        Parameters:
+            channel_number (int): Zero-based channel index.
+        """
+        return None
+
+    def read_data(self, read_elements_count: int = 100, channel_number: int = 0, timeout: int = 1000):
+        """
+        Reads samples into the device buffer pool.
+
+        The returned array is reused by the next read of the same channel,
+        so copy it if the samples have to outlive the next call.
+        """
+        buffer = self.get_buffer(read_elements_count, channel_number)
+        return self.read_into(buffer, channel_number, read_elements_count, timeout)
+
+    def get_block_buffer(self, channel_numbers: Sequence[int], read_elements_count: int) -> np.ndarray:
+        """
+        Returns the reusable (channels x samples) buffer for the given channel set.
+
+        Parameters:
+            channel_numbers (Sequence[int]): Zero-based channel indexes, one row each.
+            read_elements_count (int): Elements per request the buffer must hold.
+        """
+        key = tuple(channel_numbers)
+        buffer = self._block_buffers.get(key)
+        if buffer is None or buffer.shape[1] != read_elements_count:
+            buffer = np.empty((len(key), read_elements_count), dtype=np.float64)
+            self._block_buffers[key] = buffer
+        return buffer
+
+    def read_block(
+        self, channel_numbers: Sequence[int], read_elements_count: int = 100, timeout: int = 1000
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Reads one EpR block for several channels into a single preallocated array.
+
+        Parameters:
+            channel_numbers (Sequence[int]): Zero-based channel indexes.
+            read_elements_count (int): Samples to read per channel.
+            timeout (int): Driver timeout in milliseconds for each channel.
+
+        Returns:
+            tuple: Boolean success mask with one entry per channel and the
+            (channels x samples) block. Rows of failed channels hold stale data.
+            The block is reused by the next read of the same channel set.
+        """
+        block = self.get_block_buffer(channel_numbers, read_elements_count)
+        success = np.zeros(len(block), dtype=bool)
+        for row, channel_number in enumerate(channel_numbers):
+            success[row], _ = self.read_into(block[row], channel_number, read_elements_count, timeout)
+        return success, block
@@ -45,6 +45,10 @@ class LinDAQ122(DAQ122):
         ]
         self.dll.DAQ122_TryReadData.restype = ctypes.c_bool
 
+        if hasattr(self.dll, "DAQ122_GetADCBufferDataSize"):
+            self.dll.DAQ122_GetADCBufferDataSize.argtypes = [ctypes.c_void_p, ctypes.c_uint32]
+            self.dll.DAQ122_GetADCBufferDataSize.restype = ctypes.c_uint32
+
     def configure_sampling_parameters(self, voltage: DAQVoltage, sample_rate: DAQSampleRate) -> bool:
         self.sample_rate = sample_rate
         if not self.dll.DAQ122_ConfigureSamplingParameters(self.obj, sample_rate.value, voltage.value):
@@ -0,0 +1,190 @@
+import logging
+import os
+import time
+from typing import Dict, Optional
+
+import numpy as np
+
+from api.base_daq122 import DAQ122
+from api.exceptions import DeviceRunTimeError
+from api.structures import DAQSampleRate, DAQVoltage
+
+logger = logging.getLogger(__name__)
+
+
+class SimDll:
+    """
+    A pure-Python stand-in for the DAQ122 shared library.
+
+    It exposes the functions of ``lib/include/daq122_c_interface.h`` and
+    generates samples at the configured ``DAQSampleRate`` pace. Every channel
+    has its own FIFO: samples accumulate from ``DAQ122_StartCollection`` on,
+    ``DAQ122_TryReadData`` waits up to ``timeout`` ms for ``read_size`` of them
+    and fails without consuming anything if they do not arrive in time, and a
+    FIFO that is not drained for longer than ``fifo_size`` samples drops its
+    oldest samples, like the device does.
+
+    Attributes:
+        waveform (str): One of ``waveforms``.
+        frequency (float): Waveform frequency, Hz.
+        amplitude (float): Waveform amplitude, V.
+        offset (float): Offset of channel 1, V; channel ``n`` gets ``offset + n - 1``.
+        noise (float): Standard deviation of the added Gaussian noise, V.
+        fifo_size (int): Samples per channel the device keeps before dropping.
+        dropped (Dict[int, int]): Samples dropped per zero-based channel.
+    """
+
+    waveforms = ("sine", "square", "triangle", "sawtooth", "noise")
+    voltage_ranges = {DAQVoltage.Voltage5V.value: 5.0, DAQVoltage.Voltage10V.value: 10.0}
+
+    def __init__(
+        self,
+        waveform: str = "sine",
+        frequency: float = 10.0,
+        amplitude: float = 1.0,
+        offset: float = 0.0,
+        noise: float = 0.01,
+        fifo_size: int = 1 << 20,
+    ):
+        if waveform not in self.waveforms:
+            raise ValueError(f"Unsupported waveform {waveform}")
+        self.waveform = waveform
+        self.frequency = frequency
+        self.amplitude = amplitude
+        self.offset = offset
+        self.noise = noise
+        self.fifo_size = fifo_size
+        self.dropped: Dict[int, int] = {}
+        self._rng = np.random.default_rng()
+        self._sample_rate = 0
+        self._voltage_range = 0.0
+        self._channels = 0
+        self._started: Optional[float] = None
+        self._read: Dict[int, int] = {}
+
+    @classmethod
+    def from_env(cls) -> "SimDll":
+        """Creates the library configured by the ``DAQ122_SIM_*`` environment variables."""
+        return cls(
+            waveform=os.environ.get("DAQ122_SIM_WAVEFORM", "sine"),
+            frequency=float(os.environ.get("DAQ122_SIM_FREQUENCY", 10.0)),
+            amplitude=float(os.environ.get("DAQ122_SIM_AMPLITUDE", 1.0)),
+            offset=float(os.environ.get("DAQ122_SIM_OFFSET", 0.0)),
+            noise=float(os.environ.get("DAQ122_SIM_NOISE", 0.01)),
+            fifo_size=int(os.environ.get("DAQ122_SIM_FIFO_SIZE", 1 << 20)),
+        )
+
+    def DAQ122_New(self):
+        return 1
+
+    def DAQ122_Delete(self, handle):
+        self._started = None
+
+    def DAQ122_ConnectedDevice(self, handle) -> bool:
+        return True
+
+    def DAQ122_UseUSBBackend(self, handle) -> bool:
+        return True
+
+    def DAQ122_InitializeDevice(self, handle) -> bool:
+        return True
+
+    def DAQ122_ConfigureSamplingParameters(self, handle, sample_rate: int, voltage: int) -> bool:
+        if DAQSampleRate.get_by_value(sample_rate) is None or voltage not in self.voltage_ranges:
+            return False
+        self._sample_rate = sample_rate
+        self._voltage_range = self.voltage_ranges[voltage]
+        return True
+
+    def DAQ122_ConfigADCChannel(self, handle, channel: int) -> bool:
+        self._channels = channel
+        return True
+
+    def DAQ122_StartCollection(self, handle) -> bool:
+        if not self._sample_rate:
+            return False
+        self._started = time.perf_counter()
+        self._read = {}
+        self.dropped = {}
+        return True
+
+    def DAQ122_StopCollection(self, handle) -> bool:
+        self._started = None
+        return True
+
+    def DAQ122_TryReadData(self, handle, channel: int, read_buffer, read_size: int, timeout: int) -> bool:
+        if self._started is None or not self._channels >> channel & 1:
+            return False
+        available = self.DAQ122_GetADCBufferDataSize(handle, channel)
+        first = self._read.get(channel, 0)
+        if available < read_size:
+            wait = (read_size - available) / self._sample_rate
+            if wait > timeout / 1000:
+                time.sleep(timeout / 1000)
+                return False
+            time.sleep(wait)
+        out = np.ctypeslib.as_array(read_buffer, shape=(read_size,))
+        out[:] = self._generate(channel, first, read_size)
+        self._read[channel] = first + read_size
+        return True
+
+    def DAQ122_GetADCBufferDataSize(self, handle, channel: int) -> int:
+        if self._started is None:
+            return 0
+        first = self._read.get(channel, 0)
+        available = self._produced() - first
+        if available > self.fifo_size:
+            lost = available - self.fifo_size
+            self.dropped[channel] = self.dropped.get(channel, 0) + lost
+            self._read[channel] = first + lost
+            available = self.fifo_size
+        return available
+
+    def _produced(self) -> int:
+        return int((time.perf_counter() - self._started) * self._sample_rate)
+
+    def _generate(self, channel: int, first: int, count: int) -> np.ndarray:
+        phase = self.frequency * (first + np.arange(count)) / self._sample_rate
+        if self.waveform == "sine":
+            wave = np.sin(2 * np.pi * phase)
+        elif self.waveform == "square":
+            wave = np.where(phase % 1 < 0.5, 1.0, -1.0)
+        elif self.waveform == "triangle":
+            wave = 1 - 4 * np.abs(phase % 1 - 0.5)
+        elif self.waveform == "sawtooth":
+            wave = 2 * (phase % 1) - 1
+        else:
+            wave = np.zeros(count)
+        samples = self.offset + channel + self.amplitude * wave
+        if self.noise:
+            samples += self._rng.normal(0.0, self.noise, count)
+        return np.clip(samples, -self._voltage_range, self._voltage_range)
+
+
+class SimDAQ122(DAQ122):
+    """
+    A DAQ122 backed by SimDll instead of the vendor library, for running without hardware.
+    """
+
+    def _define_dll(self):
+        return None
+
+    def _load_dll(self, dll_path):
+        return SimDll.from_env()
+
+    def _setup_function_prototypes(self):
+        pass
+
+    @property
+    def fifo_size(self) -> int:
+        return self.dll.fifo_size
+
+    def dropped_samples(self, channel_number: int = 0) -> int:
+        return self.dll.dropped.get(channel_number, 0)
+
+    def configure_sampling_parameters(self, voltage: DAQVoltage, sample_rate: DAQSampleRate) -> bool:
+        self.sample_rate = sample_rate
+        if not self.dll.DAQ122_ConfigureSamplingParameters(self.obj, sample_rate.value, voltage.value):
+            logger.debug("Failed to configure sampling parameters.")
+            raise DeviceRunTimeError("Failed to configure sampling parameters.")
+        return True
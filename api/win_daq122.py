@@ -47,3 +47,7 @@ class WinDAQ122(DAQ122):
             ctypes.c_uint32,  # timeout
         ]
         self.dll.DAQ122_TryReadData.restype = ctypes.c_bool
+
+        if hasattr(self.dll, "DAQ122_GetADCBufferDataSize"):
+            self.dll.DAQ122_GetADCBufferDataSize.argtypes = [ctypes.POINTER(ctypes.c_uint32), ctypes.c_uint32]
+            self.dll.DAQ122_GetADCBufferDataSize.restype = ctypes.c_uint32
@@ -5,6 +5,7 @@ from PyQt5.QtGui import QIcon
 
 from application.widgets import PlotWidget
 from application.widgets.data_table import DataTable
+from application.widgets.diagnostics import DiagnosticsGroup
 from application.widgets.config_group import ConfigGroup
 from application.widgets.initialize_group import InitializeGroup
 from application.widgets.log import LogWidget, LogHandler
@@ -38,6 +39,9 @@ class MainWidget(QtWidgets.QWidget):
         self.measure_group = MeasureGroup(self)
         right_vlayout.addWidget(self.measure_group)
 
+        self.diagnostics_widget = DiagnosticsGroup(self)
+        right_vlayout.addWidget(self.diagnostics_widget)
+
         self.data_table = DataTable(self)
         right_vlayout.addWidget(self.data_table)
 
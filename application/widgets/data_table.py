@@ -1,12 +1,24 @@
+import logging
 from typing import Optional
 
 from PyQt5 import QtGui, QtWidgets, QtCore
-from PyQt5.QtWidgets import QAbstractItemView, QMessageBox, QWidget, QVBoxLayout, QHeaderView
+from PyQt5.QtWidgets import (
+    QAbstractItemView,
+    QFileDialog,
+    QHBoxLayout,
+    QHeaderView,
+    QMessageBox,
+    QPushButton,
+    QVBoxLayout,
+    QWidget,
+)
 
 from application.widgets.dialogs.comment_dialog import CommentDialogBox
 from constants import DataTableColumns
 from store.data import MeasureTableModel, MeasureManager, MeasureModel
 
+logger = logging.getLogger(__name__)
+
 
 class TableView(QtWidgets.QTableView):
     def __init__(self, parent: QtWidgets.QWidget = None):
@@ -17,6 +29,7 @@ class TableView(QtWidgets.QTableView):
 
         self.action_comment = QtWidgets.QAction("Comment", self)
         self.action_save = QtWidgets.QAction("Save", self)
+        self.action_cancel_save = QtWidgets.QAction("Cancel saving", self)
         self.action_delete = QtWidgets.QAction("Delete", self)
 
         self.action_comment.setIcon(QtGui.QIcon("assets/edit-icon.png"))
@@ -25,10 +38,12 @@ class TableView(QtWidgets.QTableView):
 
         self.menu.addAction(self.action_comment)
         self.menu.addAction(self.action_save)
+        self.menu.addAction(self.action_cancel_save)
         self.menu.addAction(self.action_delete)
 
         self.action_comment.triggered.connect(self.commentSelectedRow)
         self.action_save.triggered.connect(self.saveSelectedRow)
+        self.action_cancel_save.triggered.connect(self.cancelSaveSelectedRow)
         self.action_delete.triggered.connect(self.deleteSelectedRows)
         self.customContextMenuRequested.connect(self.showContextMenu)
 
@@ -43,6 +58,12 @@ class TableView(QtWidgets.QTableView):
             return
         model.manager.save_by_index(rows[0])
 
+    def cancelSaveSelectedRow(self):
+        measure_model = self.get_selected_measure_model()
+        if not measure_model:
+            return
+        measure_model.objects.cancel_save(measure_model.id)
+
     def get_selected_measure_model(self) -> Optional[MeasureModel]:
         model = self.model()
         selection = self.selectionModel()
@@ -95,6 +116,15 @@ class DataTable(QWidget):
         self.createTableView()
         self.layout.addWidget(self.tableView)
 
+        hlayout = QHBoxLayout()
+        self.btn_save_session = QPushButton("Save session", self)
+        self.btn_save_session.clicked.connect(self.save_session)
+        self.btn_load_session = QPushButton("Load session", self)
+        self.btn_load_session.clicked.connect(self.load_session)
+        hlayout.addWidget(self.btn_save_session)
+        hlayout.addWidget(self.btn_load_session)
+        self.layout.addLayout(hlayout)
+
     def createTableView(self):
         self.tableView = TableView(self)
 
@@ -111,3 +141,18 @@ class DataTable(QWidget):
             header.setSectionResizeMode(col.index, QHeaderView.Stretch)
 
         self.tableView.verticalHeader().setVisible(False)
+
+    @staticmethod
+    def save_session():
+        thread = MeasureManager.save_all()
+        if thread:
+            logger.info(f"Saving session to {thread.filepath}")
+
+    def load_session(self):
+        filepath, _ = QFileDialog.getOpenFileName(self, caption="Load session", directory="dumps", filter="*.h5")
+        if not filepath:
+            return
+        try:
+            MeasureManager.load_session(filepath)
+        except (OSError, ValueError, KeyError) as e:
+            logger.error(f"Unable to load session {filepath}: {e}")
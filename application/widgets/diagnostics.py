@@ -0,0 +1,71 @@
+from typing import Any, Dict
+
+from PyQt5 import QtWidgets, QtCore
+
+
+class DiagnosticsGroup(QtWidgets.QGroupBox):
+    rows = (
+        ("read_latency", "Read latency p50 / p99, ms:"),
+        ("read_failures", "Read failures:"),
+        ("read_timeouts", "Read timeouts:"),
+        ("buffer_overflows", "Full driver buffer reads:"),
+        ("loop_time", "Loop time p50 / p99, ms:"),
+        ("acquired", "Acquired / expected:"),
+        ("backlog", "Backlog, samples:"),
+        ("overruns", "Overrun samples:"),
+        ("dropped", "Device dropped samples:"),
+        ("lost_rate", "Lost samples/s:"),
+        ("frame_backlog", "Frame backlog:"),
+        ("memory", "Stored measures, MB:"),
+    )
+
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.setTitle("Diagnostics")
+
+        flayout = QtWidgets.QFormLayout()
+        self.labels: Dict[str, QtWidgets.QLabel] = {}
+        for name, title in self.rows:
+            label = QtWidgets.QLabel("", self)
+            self.labels[name] = label
+            flayout.addRow(title, label)
+        flayout.setFormAlignment(QtCore.Qt.AlignmentFlag.AlignLeft)
+
+        self.setLayout(flayout)
+
+    def set_metrics(self, metrics: Dict[str, Any], stored_nbytes: int = 0):
+        """
+        Shows an ``AcquisitionEngine.metrics()`` snapshot.
+
+        Parameters:
+            metrics (dict): Snapshot of the running engine.
+            stored_nbytes (int): Bytes held in RAM by stored measures.
+        """
+        if "read_latency" in metrics:
+            latency = metrics["read_latency"]
+            self.labels["read_latency"].setText(f"{latency['p50_ms']:.2f} / {latency['p99_ms']:.2f}")
+            self.labels["read_failures"].setText(self.per_channel(metrics["read_failures"]))
+            self.labels["read_timeouts"].setText(str(metrics["read_timeouts"]))
+            self.labels["buffer_overflows"].setText(self.per_channel(metrics["buffer_overflows"]))
+        loop_time = metrics["loop_time"]
+        self.labels["loop_time"].setText(f"{loop_time['p50_ms']:.2f} / {loop_time['p99_ms']:.2f}")
+        if "acquired_samples" in metrics:
+            acquired = min(metrics["acquired_samples"].values(), default=0)
+            expected = max(metrics["expected_samples"], 1)
+            self.labels["acquired"].setText(f"{acquired} / {expected} ({100 * acquired / expected:.1f} %)")
+            self.labels["backlog"].setText(self.per_channel(metrics["backlog_samples"]))
+            self.labels["overruns"].setText(self.per_channel(metrics["overrun_samples"]))
+            self.labels["dropped"].setText(self.per_channel(metrics["dropped_samples"]))
+            self.labels["lost_rate"].setText(f"{metrics['lost_rate']:.0f}")
+        self.labels["frame_backlog"].setText(str(metrics.get("frame_backlog", "")))
+        self.labels["memory"].setText(f"{stored_nbytes / (1 << 20):.1f}")
+
+    @staticmethod
+    def per_channel(values: Dict[int, int]) -> str:
+        if not any(values.values()):
+            return "0"
+        return ", ".join(f"AI{channel}: {value}" for channel, value in values.items() if value)
+
+    def reset_values(self):
+        for label in self.labels.values():
+            label.setText("")
@@ -1,17 +1,35 @@
 import logging
+from queue import Empty, SimpleQueue
 
 from PyQt5 import QtWidgets
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QTimer
+
+from store.state import State
 
 
 class LogWidget(QtWidgets.QGroupBox):
+    """
+    Shows log records queued from any thread.
+
+    ``set_log`` only enqueues, a timer on the GUI thread appends the queued
+    lines in batches, collapses consecutive repeats of the same message and
+    keeps at most ``State.log_max_lines`` lines in the document.
+    """
+
+    flush_interval = 100  # ms
+    max_batch = 200
+
     def __init__(self, parent):
         super().__init__(parent)
         self.setTitle("Log")
+        self.queue = SimpleQueue()
+        self._last_key = None
+        self._repeats = 0
 
         layout = QtWidgets.QHBoxLayout()
-        self.content = QtWidgets.QTextEdit(self)
+        self.content = QtWidgets.QPlainTextEdit(self)
         self.content.setReadOnly(True)
+        self.content.setMaximumBlockCount(State.log_max_lines)
         self.content.setSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Preferred)
 
         self.btn_clear = QtWidgets.QPushButton("Clear", self)
@@ -21,11 +39,45 @@ class LogWidget(QtWidgets.QGroupBox):
         layout.addWidget(self.btn_clear, alignment=Qt.AlignmentFlag.AlignRight)
         self.setLayout(layout)
 
-    def set_log(self, text: str):
-        lines = self.content.toPlainText().split("\n")
-        lines.append(text)
-        lines = lines[-50:]
-        self.content.setPlainText("\n".join(lines))
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.flush)
+        self.timer.start(self.flush_interval)
+
+    def set_log(self, text: str, key: str = None):
+        """
+        Queues a line, safe to call from any thread.
+
+        Parameters:
+            text (str): Line to show.
+            key (str): Identity of the message used to collapse repeats, defaults to ``text``.
+        """
+        self.queue.put((key if key is not None else text, text))
+
+    def flush(self):
+        lines = []
+        while True:
+            try:
+                key, text = self.queue.get_nowait()
+            except Empty:
+                break
+            if key == self._last_key:
+                self._repeats += 1
+                continue
+            if self._repeats:
+                lines.append(f"Last message repeated {self._repeats} times")
+                self._repeats = 0
+            self._last_key = key
+            lines.append(text)
+        if self._repeats:
+            lines.append(f"Last message repeated {self._repeats} times")
+            self._repeats = 0
+        if len(lines) > self.max_batch:
+            dropped = len(lines) - self.max_batch
+            lines = lines[-self.max_batch :]
+            lines.insert(0, f"{dropped} log lines skipped")
+        if not lines:
+            return
+        self.content.appendPlainText("\n".join(lines))
         self.content.verticalScrollBar().setValue(self.content.verticalScrollBar().maximum())
 
     def clear_log(self):
@@ -39,7 +91,7 @@ class LogHandler(logging.Handler):
 
     def emit(self, record):
         log_entry = self.format(record)
-        self.log_widget.set_log(log_entry)
+        self.log_widget.set_log(log_entry, key=f"{record.levelno}:{record.getMessage()}")
 
 
 class StdoutRedirector:
@@ -1,15 +1,21 @@
 import logging
 import time
-from typing import Dict
+from datetime import datetime
+from typing import Dict, List
 
-import numpy as np
-from PyQt5 import QtWidgets, QtCore
+from PyQt5 import QtWidgets, QtCore, QtGui
 from PyQt5.QtCore import pyqtSignal
 
-from api import get_daq_class
+from acquisition.decimation import DecimationFilter, stream_attrs, stream_factors, stream_name
+from acquisition.engine import AcquisitionEngine
+from acquisition.frame import Frame
+from acquisition.frame_buffer import FrameBuffer
+from acquisition.sinks import FrameSink, RecorderSink, StatisticsSink, StoreSink
+from acquisition.statistics import StatisticsEngine
 from api.exceptions import DeviceError
-from api.structures import DAQADCChannel
+from store.channel_store import ChannelStore
 from store.data import MeasureManager
+from store.recorder import HDF5Recorder
 from store.state import State
 
 
@@ -18,8 +24,11 @@ logger = logging.getLogger(__name__)
 
 class MeasureThread(QtCore.QThread):
     finished = pyqtSignal(int)
-    data_plot = pyqtSignal(list)
     log = pyqtSignal(dict)
+    # Measures are created and stored by the GUI thread, the table and plots read MeasureManager there.
+    measure_requested = pyqtSignal()
+    # Samples per channel and stream reserved up front, ChannelArray grows beyond it.
+    initial_reserved_count = 1 << 18
 
     def __init__(self, parent):
         super().__init__(parent)
@@ -29,89 +38,165 @@ class MeasureThread(QtCore.QThread):
         self.read_elements_count = State.read_elements_count.value
         self.sample_rate = State.sample_rate
         self.voltage = State.voltage
-        self.is_average = State.is_average
+        self.decimation_filter = State.decimation_filter
+        if State.store_raw or State.decimated_rates:
+            self.decimations = stream_factors(self.sample_rate.value, State.store_raw, State.decimated_rates)
+        else:
+            self.decimations = [self.read_elements_count]
         self.selected_channels = sorted(State.selected_channels)
+        self.target_latency = State.target_latency
+        self.stream_path = None
+        self.compression = State.compression
+        self.store_dtype = State.store_dtype
+        self.recorder = None
+        self.frames = FrameBuffer()
+        self.statistics = StatisticsEngine(
+            self.selected_channels,
+            window=State.stats_window,
+            length=State.stats_length,
+            alpha=2 / (State.stats_length + 1),
+        )
+        self.engine = None
+
+    @property
+    def streams(self) -> Dict[str, Dict]:
+        """Attributes of the decimated streams stored next to the primary one, by name."""
+        return {
+            stream_name(factor, self.decimation_filter): stream_attrs(
+                self.sample_rate.value, factor, self.decimation_filter
+            )
+            for factor in self.decimations[1:]
+        }
+
+    @property
+    def data_attrs(self) -> Dict:
+        primary = stream_attrs(self.sample_rate.value, self.decimations[0], self.decimation_filter)
+        return {
+            "sample_rate": self.sample_rate.value,
+            "voltage": self.voltage.name,
+            "epr": self.read_elements_count,
+            "decimation": primary["decimation"],
+            "filter": primary["filter"],
+            # Kept for readers of the former EpR block means switch.
+            "is_average": primary["filter"] == DecimationFilter.Boxcar.value
+            and primary["decimation"] == self.read_elements_count,
+        }
 
     def create_measure(self):
         if self.store_data:
-            self.measure = MeasureManager.create(
-                data={
-                    "sample_rate": self.sample_rate.value,
-                    "voltage": self.voltage.name,
-                    "epr": self.read_elements_count,
-                    "is_average": self.is_average,
-                    "data": {channel: [] for channel in self.selected_channels},
-                }
+            store = ChannelStore(
+                self.selected_channels, dtype=self.store_dtype, capacity=self.expected_count(self.decimations[0])
             )
+            for (name, attrs), factor in zip(self.streams.items(), self.decimations[1:]):
+                store.streams[name] = ChannelStore(
+                    self.selected_channels, dtype=self.store_dtype, capacity=self.expected_count(factor), attrs=attrs
+                )
+            self.measure = MeasureManager.create(data={**self.data_attrs, "data": store})
             self.measure.save(finish=False)
 
+    def expected_count(self, decimation: int) -> int:
+        return min(self.duration * self.sample_rate.value // decimation, self.initial_reserved_count)
+
+    def create_recorder(self):
+        if not self.stream_path:
+            return
+        attrs = {"started": datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
+        if self.measure:
+            attrs = self.measure.get_hdf5_attrs()
+        self.recorder = HDF5Recorder(
+            self.stream_path,
+            channels=self.selected_channels,
+            attrs=attrs,
+            data_attrs=self.data_attrs,
+            compression=self.compression,
+            streams=self.streams,
+        )
+        self.recorder.open()
+
     def run(self) -> None:
-        DAQ122 = get_daq_class()
+        engine = AcquisitionEngine(
+            channels=self.selected_channels,
+            voltage=self.voltage,
+            sample_rate=self.sample_rate,
+            read_elements_count=self.read_elements_count,
+            duration=self.duration,
+            target_latency=self.target_latency,
+        )
         try:
-            with DAQ122() as daq:
-                if not daq.is_connected():
-                    self.finish(1)
-                    return
-                self.log.emit({"type": "info", "msg": "Device Connected!"})
-
-                if not daq.configure_sampling_parameters(self.voltage, self.sample_rate):
-                    self.finish(1)
-                    return
-                self.log.emit({"type": "info", "msg": "Sampling parameters configured"})
-
-                if not daq.config_adc_channel(DAQADCChannel.AIN_ALL):
-                    self.finish(1)
-                    return
-
-                self.log.emit({"type": "info", "msg": "Channels configured"})
-
-                self.create_measure()
-
-                daq.start_collection()
-
-                start = time.time()
-                while State.is_measuring:
-                    data_plot = []
-                    time.sleep(self.read_elements_count / self.sample_rate.value / 2)
-                    for channel in self.selected_channels:
-                        success, data = daq.read_data(
-                            read_elements_count=self.read_elements_count, channel_number=channel - 1, timeout=5000
-                        )
-                        if success:
-                            duration = time.time() - start
-                            measured_data = data[: self.read_elements_count]
-                            mean = np.mean(measured_data)
-                            if self.store_data and self.measure:
-                                if self.is_average:
-                                    self.measure.data["data"][channel].append(mean)
-                                else:
-                                    self.measure.data["data"][channel].extend(list(measured_data))
-
-                            data_plot.append({"channel": channel, "voltage": mean, "time": duration})
-
-                            if duration > self.duration:
-                                State.is_measuring = False
-                    if data_plot:
-                        self.data_plot.emit(data_plot)
+            engine.start()
         except DeviceError as e:
             self.log.emit({"type": "error", "msg": str(e)})
             self.finish(1)
             return
+        self.engine = engine
+        self.log.emit({"type": "info", "msg": "Device Connected!"})
+        self.log.emit({"type": "info", "msg": "Sampling parameters configured"})
+        self.log.emit({"type": "info", "msg": "Channels configured"})
+
+        self.measure_requested.emit()
+        try:
+            self.create_recorder()
+        except OSError as e:
+            engine.stop()
+            self.log.emit({"type": "error", "msg": f"Unable to stream to {self.stream_path}: {e}"})
+            self.finish(1)
+            return
 
-        self.finish(0)
+        engine.add_sink(StatisticsSink(self.statistics))
+        kind = self.decimation_filter
+        if self.store_data and self.measure:
+            store = self.measure.data["data"]
+            engine.add_sink(StoreSink(store, self.decimations[0], kind))
+            for name, factor in zip(self.streams, self.decimations[1:]):
+                engine.add_sink(StoreSink(store.streams[name], factor, kind))
+        if self.recorder:
+            engine.add_sink(RecorderSink(self.recorder, self.decimations[0], kind))
+            for name, factor in zip(self.streams, self.decimations[1:]):
+                engine.add_sink(RecorderSink(self.recorder, factor, kind, stream=name))
+        engine.add_sink(FrameSink(self.frames))
+
+        code = 0
+        try:
+            engine.run(keep_running=lambda: State.is_measuring)
+        except DeviceError as e:
+            self.log.emit({"type": "error", "msg": str(e)})
+            code = 1
+        State.is_measuring = False
+        self.finish(code)
 
     def finish(self, code: int = 0):
         if self.store_data and self.measure:
-            self.measure.save(finish=True)
+            self.measure.finished = datetime.now()
+        if self.recorder:
+            attrs = {"finished": datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
+            if self.measure:
+                attrs = self.measure.get_hdf5_attrs()
+                self.measure.saved = True
+                self.measure.filepath = self.stream_path
+            self.recorder.close(attrs=attrs)
         self.finished.emit(code)
 
+    def store_measure(self):
+        """Trims the finished measure and enforces the memory budget, called in the GUI thread."""
+        if self.store_data and self.measure:
+            self.measure.data["data"].trim()
+            self.measure.save(finish=False)
+            MeasureManager.enforce_memory_budget()
+
 
 class MeasureGroup(QtWidgets.QGroupBox):
+    diagnostics_interval = 0.5
+
     def __init__(self, parent):
         super().__init__(parent)
         self.thread_measure = None
+        self.skipped_frames = 0
+        self.diagnostics_updated = 0.0
         self.setTitle("Measure")
 
+        self.render_timer = QtCore.QTimer(self)
+        self.render_timer.timeout.connect(self.render_frame)
+
         vlayout = QtWidgets.QVBoxLayout()
         hlayout = QtWidgets.QHBoxLayout()
         flayout = QtWidgets.QFormLayout()
@@ -131,22 +216,44 @@ class MeasureGroup(QtWidgets.QGroupBox):
         self.plot_window_label.setHidden(not State.is_plot_data)
 
         self.plot_window = QtWidgets.QSpinBox(self)
-        self.plot_window.setRange(1, 10000)
+        self.plot_window.setRange(1, 2000000)
         self.plot_window.setValue(State.plot_window)
         self.plot_window.valueChanged.connect(self.set_plot_window)
         self.plot_window.setHidden(not State.is_plot_data)
 
+        self.ui_fps = QtWidgets.QSpinBox(self)
+        self.ui_fps.setRange(1, 120)
+        self.ui_fps.setValue(State.ui_fps)
+        self.ui_fps.setToolTip("Plot and monitor refresh rate, updates in between are merged")
+        self.ui_fps.valueChanged.connect(self.set_ui_fps)
+
         self.read_elements = QtWidgets.QSpinBox(self)
         self.read_elements.setRange(1, 10000)
         self.read_elements.setValue(State.read_elements_count.value)
         self.read_elements.valueChanged.connect(self.set_read_elements)
         State.read_elements_count.signal_value.connect(lambda val: self.read_elements.setValue(int(val)))
 
-        self.is_average = QtWidgets.QCheckBox(self)
-        self.is_average.setText("Average EpR")
-        self.is_average.setToolTip("Averaging Elements per Request")
-        self.is_average.setChecked(State.is_average)
-        self.is_average.stateChanged.connect(self.set_average)
+        self.store_raw = QtWidgets.QCheckBox(self)
+        self.store_raw.setText("Store raw samples")
+        self.store_raw.setToolTip("Storing every ADC sample, next to the decimated streams")
+        self.store_raw.setChecked(State.store_raw)
+        self.store_raw.stateChanged.connect(self.set_store_raw)
+
+        self.decimated_rates = QtWidgets.QLineEdit(self)
+        self.decimated_rates.setText(", ".join(f"{rate:g}" for rate in State.decimated_rates))
+        self.decimated_rates.setPlaceholderText("one point per EpR block")
+        self.decimated_rates.setToolTip(
+            "Comma separated output rates of the decimated streams, independent of EpR.\n"
+            "Leave empty without raw samples to store one point per EpR block, the mean with the boxcar filter."
+        )
+        self.decimated_rates.setValidator(QtGui.QRegExpValidator(QtCore.QRegExp(r"[0-9.,\s]*"), self))
+        self.decimated_rates.editingFinished.connect(self.set_decimated_rates)
+
+        self.decimation_filter = QtWidgets.QComboBox(self)
+        self.decimation_filter.addItems([it.value for it in DecimationFilter])
+        self.decimation_filter.setCurrentText(State.decimation_filter.value)
+        self.decimation_filter.setToolTip("Anti-aliasing filter of the decimated streams")
+        self.decimation_filter.currentIndexChanged.connect(self.set_decimation_filter)
 
         self.store_data = QtWidgets.QCheckBox(self)
         self.store_data.setText("Store Data")
@@ -154,14 +261,48 @@ class MeasureGroup(QtWidgets.QGroupBox):
         self.store_data.setChecked(State.store_data)
         self.store_data.stateChanged.connect(self.set_store_data)
 
+        self.store_dtype = QtWidgets.QComboBox(self)
+        self.store_dtype.addItems(ChannelStore.dtypes)
+        self.store_dtype.setCurrentText(State.store_dtype)
+        self.store_dtype.setToolTip("Precision of stored samples, float32 halves memory usage")
+        self.store_dtype.currentTextChanged.connect(self.set_store_dtype)
+
+        self.memory_budget = QtWidgets.QSpinBox(self)
+        self.memory_budget.setRange(1, 1024 * 1024)
+        self.memory_budget.setValue(State.memory_budget)
+        self.memory_budget.setToolTip("Older stored measures are moved to disk above this size")
+        self.memory_budget.valueChanged.connect(self.set_memory_budget)
+
+        self.stream_data = QtWidgets.QCheckBox(self)
+        self.stream_data.setText("Stream to file")
+        self.stream_data.setToolTip("Writing data to HDF5 file while measuring")
+        self.stream_data.setChecked(State.stream_data)
+        self.stream_data.stateChanged.connect(self.set_stream_data)
+
+        self.compression_label = QtWidgets.QLabel("Compression:", self)
+        self.compression_label.setHidden(not State.stream_data)
+
+        self.compression = QtWidgets.QComboBox(self)
+        self.compression.addItems([str(it) for it in HDF5Recorder.compressions])
+        self.compression.setCurrentText(str(State.compression))
+        self.compression.currentIndexChanged.connect(self.set_compression)
+        self.compression.setHidden(not State.stream_data)
+
         flayout.setLabelAlignment(QtCore.Qt.AlignmentFlag.AlignLeft)
         flayout.setFormAlignment(QtCore.Qt.AlignmentFlag.AlignLeft)
         flayout.addRow("Measuring Time, s:", self.duration)
         flayout.addRow("Elements per Request:", self.read_elements)
-        flayout.addRow(self.is_average)
+        flayout.addRow(self.store_raw)
+        flayout.addRow("Decimated rates, Hz:", self.decimated_rates)
+        flayout.addRow("Decimation filter:", self.decimation_filter)
         flayout.addRow(self.store_data)
+        flayout.addRow("Store precision:", self.store_dtype)
+        flayout.addRow("Memory budget, MB:", self.memory_budget)
+        flayout.addRow(self.stream_data)
+        flayout.addRow(self.compression_label, self.compression)
         flayout.addRow(self.is_plot_data)
         flayout.addRow(self.plot_window_label, self.plot_window)
+        flayout.addRow("UI refresh, FPS:", self.ui_fps)
 
         self.btn_start = QtWidgets.QPushButton("Start", self)
         self.btn_start.clicked.connect(self.start_measure)
@@ -179,14 +320,27 @@ class MeasureGroup(QtWidgets.QGroupBox):
         if not len(State.selected_channels):
             logger.warning("You have to select at least one channel!")
             return
+        stream_path = None
+        if State.stream_data:
+            stream_path, _ = QtWidgets.QFileDialog.getSaveFileName(filter="*.h5", caption="Streaming measure to")
+            if not stream_path:
+                return
+            if not stream_path.endswith(".h5"):
+                stream_path += ".h5"
         self.parent().plot_widget.clear()
         self.parent().monitor_widget.reset_values()
+        self.parent().diagnostics_widget.reset_values()
         self.thread_measure = MeasureThread(self)
-        self.thread_measure.data_plot.connect(self.plot_data)
+        self.thread_measure.stream_path = stream_path
         self.thread_measure.log.connect(self.set_log)
         self.btn_start.setEnabled(False)
         self.thread_measure.finished.connect(self.finish_measure)
+        self.thread_measure.measure_requested.connect(
+            self.thread_measure.create_measure, QtCore.Qt.ConnectionType.BlockingQueuedConnection
+        )
         State.is_measuring = True
+        self.skipped_frames = 0
+        self.render_timer.start(int(1000 / State.ui_fps))
         self.thread_measure.start()
 
     @staticmethod
@@ -196,16 +350,36 @@ class MeasureGroup(QtWidgets.QGroupBox):
         State.is_measuring = False
 
     def finish_measure(self, code: int = 0):
+        self.render_timer.stop()
+        self.render_frame()
+        self.thread_measure.store_measure()
         self.btn_start.setEnabled(True)
         if code == 0:
             logger.info("Measure finished successfully!")
         else:
             logger.error("Measure finished due to Error!")
 
-    def plot_data(self, data: list):
-        if self.is_plot_data.isChecked():
-            self.parent().plot_widget.add_plots(data)
-        self.parent().monitor_widget.add_data(data)
+    def render_frame(self):
+        if not self.thread_measure:
+            return
+        engine = self.thread_measure.engine
+        if self.is_plot_data.isChecked() and State.plot_mode == "Scope" and engine:
+            self.parent().plot_widget.update_scope(engine.reader.rings, self.thread_measure.sample_rate.value)
+        if engine and time.monotonic() - self.diagnostics_updated >= self.diagnostics_interval:
+            self.diagnostics_updated = time.monotonic()
+            self.parent().diagnostics_widget.set_metrics(engine.metrics(), MeasureManager.resident_nbytes())
+        updates, pushed = self.thread_measure.frames.take()
+        if not updates:
+            return
+        self.skipped_frames += pushed - 1
+        self.plot_data(updates)
+        self.parent().monitor_widget.set_statistics(self.thread_measure.statistics.summaries())
+        self.parent().monitor_widget.set_skipped_frames(self.skipped_frames)
+
+    def plot_data(self, updates: List[Frame]):
+        if self.is_plot_data.isChecked() and State.plot_mode == "Trend":
+            self.parent().plot_widget.add_plots(updates)
+        self.parent().monitor_widget.add_data(updates[-1])
 
     @staticmethod
     def set_duration(value):
@@ -225,20 +399,59 @@ class MeasureGroup(QtWidgets.QGroupBox):
     def set_plot_window(value):
         State.plot_window = int(value)
 
+    def set_ui_fps(self, value):
+        State.ui_fps = int(value)
+        if self.render_timer.isActive():
+            self.render_timer.setInterval(int(1000 / State.ui_fps))
+
     @staticmethod
     def set_read_elements(value):
         State.read_elements_count.value = int(value)
 
     @staticmethod
-    def set_average(state):
+    def set_store_raw(state):
         value = state == QtCore.Qt.CheckState.Checked
-        State.is_average = value
+        State.store_raw = value
+
+    def set_decimated_rates(self):
+        rates = []
+        for value in self.decimated_rates.text().split(","):
+            try:
+                rate = float(value)
+            except ValueError:
+                continue
+            if rate > 0:
+                rates.append(rate)
+        State.decimated_rates = rates
+
+    @staticmethod
+    def set_decimation_filter(index):
+        State.decimation_filter = DecimationFilter.get_by_index(index)
 
     @staticmethod
     def set_store_data(state):
         value = state == QtCore.Qt.CheckState.Checked
         State.store_data = value
 
+    @staticmethod
+    def set_store_dtype(value):
+        State.store_dtype = value
+
+    @staticmethod
+    def set_memory_budget(value):
+        State.memory_budget = int(value)
+        MeasureManager.enforce_memory_budget()
+
+    def set_stream_data(self, state):
+        value = state == QtCore.Qt.CheckState.Checked
+        self.compression.setHidden(not value)
+        self.compression_label.setHidden(not value)
+        State.stream_data = value
+
+    @staticmethod
+    def set_compression(index):
+        State.compression = HDF5Recorder.compressions[index]
+
     @staticmethod
     def set_log(log: Dict):
         log_type = log.get("type")
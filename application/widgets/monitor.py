@@ -2,8 +2,14 @@ from typing import List, Dict
 
 from PyQt5 import QtWidgets, QtCore
 
+from acquisition.frame import Frame
+from acquisition.statistics import StatisticsWindow
+from store.state import State
+
 
 class MonitorGroup(QtWidgets.QGroupBox):
+    statistics = ("mean", "min", "max", "rms", "std")
+
     def __init__(self, parent):
         super().__init__(parent)
         self.setTitle("Monitor")
@@ -12,14 +18,40 @@ class MonitorGroup(QtWidgets.QGroupBox):
         glayout = QtWidgets.QGridLayout()
         flayout = QtWidgets.QFormLayout()
 
+        glayout.addWidget(QtWidgets.QLabel("Last", self), 1, 0)
+        for row, name in enumerate(self.statistics, start=2):
+            glayout.addWidget(QtWidgets.QLabel(name.capitalize(), self), row, 0)
+
+        self.last_labels: List[QtWidgets.QLabel] = []
+        self.stat_labels: Dict[str, List[QtWidgets.QLabel]] = {name: [] for name in self.statistics}
         for i in range(8):
-            glayout.addWidget(QtWidgets.QLabel(f"AI{i+1}", self), 0, i)
+            glayout.addWidget(QtWidgets.QLabel(f"AI{i+1}", self), 0, i + 1)
             ai = QtWidgets.QLabel("", self)
             setattr(self, f"ai{i+1}", ai)
-            glayout.addWidget(ai, 1, i)
+            self.last_labels.append(ai)
+            glayout.addWidget(ai, 1, i + 1)
+            for row, name in enumerate(self.statistics, start=2):
+                label = QtWidgets.QLabel("", self)
+                self.stat_labels[name].append(label)
+                glayout.addWidget(label, row, i + 1)
+
+        self.stats_window = QtWidgets.QComboBox(self)
+        self.stats_window.addItems([it.value for it in StatisticsWindow])
+        self.stats_window.setCurrentText(State.stats_window.value)
+        self.stats_window.currentIndexChanged.connect(self.set_stats_window)
+
+        self.stats_length = QtWidgets.QSpinBox(self)
+        self.stats_length.setRange(1, 100000)
+        self.stats_length.setValue(State.stats_length)
+        self.stats_length.setToolTip("Sliding window length or exponential span, blocks")
+        self.stats_length.valueChanged.connect(self.set_stats_length)
 
         self.timer = QtWidgets.QLabel("", self)
         flayout.addRow("Timer:", self.timer)
+        self.skipped_frames = QtWidgets.QLabel("", self)
+        flayout.addRow("Frames skipped:", self.skipped_frames)
+        flayout.addRow("Statistics window:", self.stats_window)
+        flayout.addRow("Window length, blocks:", self.stats_length)
         flayout.setFormAlignment(QtCore.Qt.AlignmentFlag.AlignLeft)
 
         vlayout.addLayout(glayout)
@@ -27,16 +59,35 @@ class MonitorGroup(QtWidgets.QGroupBox):
 
         self.setLayout(vlayout)
 
-    def add_data(self, data: List[Dict]):
-        for dat in data:
-            ai = getattr(self, f"ai{dat['channel']}")
-            ai.setText(f"{dat['voltage']:.5f}")
+    def add_data(self, frame: Frame):
+        for channel, value in zip(frame.channels, frame.values.tolist()):
+            self.last_labels[channel - 1].setText(f"{value:.5f}")
 
-        self.timer.setText(f"{data[0]['time']:.3f}")
+        self.timer.setText(f"{frame.time:.3f}")
+
+    def set_statistics(self, summaries: Dict[int, Dict[str, float]]):
+        for channel, summary in summaries.items():
+            for name in self.statistics:
+                self.stat_labels[name][channel - 1].setText(f"{summary[name]:.5f}")
+
+    def set_skipped_frames(self, value: int):
+        self.skipped_frames.setText(str(value))
 
     def reset_values(self):
         for i in range(1, 9):
             ai = getattr(self, f"ai{i}")
             ai.setText("")
+        for labels in self.stat_labels.values():
+            for label in labels:
+                label.setText("")
 
         self.timer.setText("")
+        self.skipped_frames.setText("")
+
+    @staticmethod
+    def set_stats_window(index):
+        State.stats_window = StatisticsWindow.get_by_index(index)
+
+    @staticmethod
+    def set_stats_length(value):
+        State.stats_length = int(value)
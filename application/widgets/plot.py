@@ -1,11 +1,127 @@
-from typing import List, Dict
+from itertools import groupby
+from typing import List, Dict, Tuple
 
+import numpy as np
 from PyQt5 import QtWidgets
 import pyqtgraph as pg
 
+from acquisition.frame import Frame
+from acquisition.ring_buffer import RingBuffer
+from acquisition.trigger import EdgeTrigger
+from application.widgets.scope import ScopeControls
 from store.state import State
 
 
+def minmax_decimate(x: np.ndarray, y: np.ndarray, buckets: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Reduces a curve to the min and max point of each of ``buckets`` equal slices.
+
+    The result has at most ``2 * buckets`` points and keeps every peak visible,
+    so drawing cost depends on the plot width instead of the number of samples.
+    """
+    count = len(y)
+    if count <= 2 * buckets:
+        return x, y
+    size = count // buckets
+    offset = count - size * buckets
+    return minmax_slices(x[offset:], y[offset:], size)
+
+
+def minmax_slices(x: np.ndarray, y: np.ndarray, size: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Returns the min and max point of every ``size`` consecutive points, in time order.
+
+    The number of points must be a multiple of ``size``.
+    """
+    buckets = len(y) // size
+    blocks = y.reshape(buckets, size)
+    base = np.arange(buckets) * size
+    ind_min = base + blocks.argmin(axis=1)
+    ind_max = base + blocks.argmax(axis=1)
+    indexes = np.empty(2 * buckets, dtype=np.intp)
+    indexes[0::2] = np.minimum(ind_min, ind_max)
+    indexes[1::2] = np.maximum(ind_min, ind_max)
+    return x[indexes], y[indexes]
+
+
+class MinMaxDecimator:
+    """
+    ``minmax_decimate`` of a sliding window of points, updated as points are appended.
+
+    Appended points are reduced once, in slices of ``size`` points, and the
+    min and max point of the slices of the last ``window`` points are kept.
+    ``points`` returns them, plus the partial slices at both ends of the
+    window, so the cost per frame depends on the new points and the plot
+    width, not on the window.
+
+    Attributes:
+        window (int): Points the curve spans.
+        buckets (int): Slices the window is reduced to.
+        size (int): Points per slice, 1 keeps every point.
+    """
+
+    def __init__(self, window: int, buckets: int, start: int = 0):
+        """
+        Parameters:
+            window (int): Points the curve spans.
+            buckets (int): Slices the window is reduced to.
+            start (int): Ring index of the first point that will be appended.
+        """
+        self.window = window
+        self.buckets = buckets
+        self.size = -(-window // buckets)
+        capacity = window if self.size == 1 else 2 * (window // self.size + 1)
+        self._x = RingBuffer(capacity)
+        self._y = RingBuffer(capacity)
+        self._pending_x = np.empty(0)
+        self._pending_y = np.empty(0)
+        # Ring index of the first pending point, the stored slices end there.
+        self._next = start
+
+    def update(self, x: np.ndarray, y: np.ndarray) -> None:
+        if self.size == 1:
+            self._x.write(x)
+            self._y.write(y)
+            return
+        if len(self._pending_y):
+            x = np.concatenate((self._pending_x, x))
+            y = np.concatenate((self._pending_y, y))
+        used = len(y) - len(y) % self.size
+        if used:
+            x_points, y_points = minmax_slices(x[:used], y[:used], self.size)
+            self._x.write(x_points)
+            self._y.write(y_points)
+            self._next += used
+        self._pending_x = np.array(x[used:], dtype=np.float64)
+        self._pending_y = np.array(y[used:], dtype=np.float64)
+
+    def points(self, x_ring: RingBuffer, y_ring: RingBuffer) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the decimated window.
+
+        Parameters:
+            x_ring (RingBuffer): The ring of ``window`` times the decimator is fed with.
+            y_ring (RingBuffer): The ring of ``window`` values the decimator is fed with.
+        """
+        x = self._x.read(self._x.oldest_index)[1]
+        y = self._y.read(self._y.oldest_index)[1]
+        if self.size == 1:
+            return x, y
+        # The oldest slices may start before the window, replace them with the points inside it.
+        oldest = x_ring.oldest_index
+        first = self._next - len(y) // 2 * self.size
+        outside = max(0, -(-(oldest - first) // self.size))
+        head_stop = first + outside * self.size
+        x_head = x_ring.read(oldest, max_count=head_stop - oldest)[1]
+        y_head = y_ring.read(oldest, max_count=head_stop - oldest)[1]
+        parts = [
+            minmax_decimate(x_head, y_head, 1),
+            (x[2 * outside :], y[2 * outside :]),
+            minmax_decimate(self._pending_x, self._pending_y, 1),
+        ]
+        return np.concatenate([part[0] for part in parts]), np.concatenate([part[1] for part in parts])
+
+
 class PlotWidget(QtWidgets.QWidget):
     colors = [
         "#1f77b4",
@@ -19,19 +135,31 @@ class PlotWidget(QtWidgets.QWidget):
         "#bcbd22",
         "#17becf",
     ]
+    max_symbol_points = 500
 
     def __init__(self, parent):
         super().__init__(parent)
         layout = QtWidgets.QVBoxLayout(self)
 
+        self.scope_controls = ScopeControls(self)
+        self.scope_controls.mode_changed.connect(self.set_mode)
+        self.scope_controls.trigger_changed.connect(self.reset_trigger)
+        self.scope_controls.armed.connect(self.arm_trigger)
+
         self.plot = pg.PlotWidget(self)
         self.prepare_plot()
+        self.buffers: Dict[int, Tuple[RingBuffer, RingBuffer]] = {}
+        self.decimators: Dict[int, MinMaxDecimator] = {}
+        self.curves: Dict[int, pg.PlotDataItem] = {}
+        self.trigger = None
+        self.reset_trigger()
 
+        layout.addWidget(self.scope_controls)
         layout.addWidget(self.plot)
         self.setLayout(layout)
 
     def prepare_plot(self):
-        x_label = "Time, s"
+        x_label = "Time from trigger, s" if State.plot_mode == "Scope" else "Time, s"
         y_label = "Voltage, V"
         self.plot.setBackground("w")
         styles = {"color": "#413C58", "font-size": "15px"}
@@ -42,28 +170,150 @@ class PlotWidget(QtWidgets.QWidget):
 
     def clear(self):
         self.plot.clear()
+        self.buffers = {}
+        self.decimators = {}
+        self.curves = {}
+        self.reset_trigger()
+
+    def set_mode(self, mode: str):
+        self.clear()
+        self.prepare_plot()
+
+    def reset_trigger(self):
+        self.trigger = EdgeTrigger(
+            level=State.scope_level,
+            slope=State.scope_slope,
+            mode=State.scope_trigger_mode,
+            record_length=State.scope_record_length,
+            pre_trigger=State.scope_pre_trigger,
+        )
+
+    def arm_trigger(self):
+        self.trigger.arm()
 
     def get_plot_items(self):
         plot_item = self.plot.getPlotItem()
         return {item.name(): item for item in plot_item.items}
 
-    def add_plots(self, data: List[Dict]):
-        items = self.get_plot_items()
-        for dat in data:
-            graph_id = f"AI{dat['channel']}"
-            if items.get(graph_id):
-                item = items.get(graph_id)
-                x_data = list(item.xData)
-                x_data.append(dat["time"])
-                y_data = list(item.yData)
-                y_data.append(dat["voltage"])
-                if len(x_data) > State.plot_window:
-                    del x_data[0]
-                    del y_data[0]
-                item.setData(x_data, y_data)
-                continue
+    def get_buffers(self, channel: int) -> Tuple[RingBuffer, RingBuffer]:
+        window = State.plot_window
+        buffers = self.buffers.get(channel)
+        if buffers and buffers[0].capacity == window:
+            return buffers
+        new_buffers = (RingBuffer(window), RingBuffer(window))
+        if buffers:
+            for old, new in zip(buffers, new_buffers):
+                new.write(old.read(old.write_index - window)[1])
+        self.buffers[channel] = new_buffers
+        self.decimators.pop(channel, None)
+        return new_buffers
+
+    def add_samples(self, channel: int, times, voltages):
+        """
+        Appends points of one channel to its plot window without redrawing.
+
+        Parameters:
+            channel (int): One-based channel number.
+            times: Time of each point, s, a scalar or an array.
+            voltages: Value of each point, V, a scalar or an array.
+        """
+        x_buffer, y_buffer = self.get_buffers(channel)
+        times = np.atleast_1d(times)
+        voltages = np.atleast_1d(voltages)
+        x_buffer.write(times)
+        y_buffer.write(voltages)
+        decimator = self.decimators.get(channel)
+        if decimator is not None:
+            decimator.update(times, voltages)
+
+    def redraw(self):
+        """
+        Draws the plot windows from their incrementally decimated points.
+
+        A window is decimated from scratch only when it is resized or the plot width changes.
+        """
+        buckets = self.buckets
+        for channel, (x_buffer, y_buffer) in self.buffers.items():
+            decimator = self.decimators.get(channel)
+            if decimator is None or decimator.buckets != buckets:
+                start, x_data = x_buffer.read(x_buffer.oldest_index)
+                decimator = MinMaxDecimator(x_buffer.capacity, buckets, start)
+                decimator.update(x_data, y_buffer.read(start)[1])
+                self.decimators[channel] = decimator
+            self.draw_curve(channel, *decimator.points(x_buffer, y_buffer))
 
-            pen = pg.mkPen(color=self.colors[dat["channel"] - 1], width=2)
-            self.plot.plot(
-                [dat["time"]], [dat["voltage"]], name=f"{graph_id}", pen=pen, symbolSize=6, symbolBrush=pen.color()
-            )
+    @property
+    def buckets(self) -> int:
+        return max(int(self.plot.getViewBox().width()), 1)
+
+    def set_curve(self, channel: int, x_data: np.ndarray, y_data: np.ndarray):
+        self.draw_curve(channel, *minmax_decimate(x_data, y_data, self.buckets))
+
+    def draw_curve(self, channel: int, x_data: np.ndarray, y_data: np.ndarray):
+        symbol = "o" if len(y_data) <= self.max_symbol_points else None
+        curve = self.curves.get(channel)
+        if curve is not None:
+            curve.setData(x_data, y_data, symbol=symbol, skipFiniteCheck=True)
+            return
+
+        pen = pg.mkPen(color=self.colors[channel - 1], width=2)
+        self.curves[channel] = self.plot.plot(
+            x_data,
+            y_data,
+            name=f"AI{channel}",
+            pen=pen,
+            symbol=symbol,
+            symbolSize=6,
+            symbolBrush=pen.color(),
+            skipFiniteCheck=True,
+        )
+
+    def update_scope(self, rings: Dict[int, RingBuffer], sample_rate: int):
+        """
+        Draws the latest triggered sweep of raw samples, if a new one is complete.
+
+        Parameters:
+            rings (Dict[int, RingBuffer]): Raw sample rings by channel number.
+            sample_rate (int): Sample rate per channel, Hz.
+        """
+        if not rings:
+            return
+        channel = State.scope_channel if State.scope_channel in rings else next(iter(rings))
+        trigger_ring = rings[channel]
+        self.trigger.record_length = min(self.trigger.record_length, trigger_ring.capacity)
+        start = self.trigger.poll(trigger_ring)
+        if start is None:
+            return
+        times = (np.arange(self.trigger.record_length) - self.trigger.pre_count) / sample_rate
+        for channel, ring in rings.items():
+            index, samples = ring.read(start, max_count=self.trigger.record_length)
+            offset = index - start
+            self.set_curve(channel, times[offset : offset + len(samples)], samples)
+
+    def add_plots(self, frames: List[Frame]):
+        """
+        Appends frames to the plot windows and redraws once.
+
+        Every block mean carried by the frames is plotted at its own time.
+        Frames without block means are plotted by their latest values;
+        consecutive ones with the same channels are stacked into one array.
+        Every channel gets a single write per call.
+        """
+        times: Dict[int, List[np.ndarray]] = {}
+        values: Dict[int, List[np.ndarray]] = {}
+        for frame in frames:
+            if frame.block_means is None:
+                continue
+            for channel, block_times, block_means in zip(frame.channels, frame.block_times, frame.block_means):
+                times.setdefault(channel, []).append(block_times)
+                values.setdefault(channel, []).append(block_means)
+        for channel in times:
+            self.add_samples(channel, np.concatenate(times[channel]), np.concatenate(values[channel]))
+        frames = [frame for frame in frames if frame.block_means is None]
+        for channels, group in groupby(frames, key=lambda frame: frame.channels):
+            group = list(group)
+            times = np.fromiter((frame.time for frame in group), dtype=float, count=len(group))
+            values = np.vstack([frame.values for frame in group])
+            for column, channel in enumerate(channels):
+                self.add_samples(channel, times, values[:, column])
+        self.redraw()
@@ -0,0 +1,117 @@
+from PyQt5 import QtWidgets, QtCore
+
+from acquisition.trigger import TriggerMode, TriggerSlope
+from store.state import State
+
+
+class ScopeControls(QtWidgets.QWidget):
+    mode_changed = QtCore.pyqtSignal(str)
+    trigger_changed = QtCore.pyqtSignal()
+    armed = QtCore.pyqtSignal()
+
+    plot_modes = ("Trend", "Scope")
+
+    def __init__(self, parent):
+        super().__init__(parent)
+
+        hlayout = QtWidgets.QHBoxLayout()
+        hlayout.setContentsMargins(0, 0, 0, 0)
+
+        self.plot_mode = QtWidgets.QComboBox(self)
+        self.plot_mode.addItems(self.plot_modes)
+        self.plot_mode.setCurrentText(State.plot_mode)
+        self.plot_mode.setToolTip("Trend plots EpR means, Scope plots raw triggered sweeps")
+        self.plot_mode.currentTextChanged.connect(self.set_plot_mode)
+
+        self.channel = QtWidgets.QComboBox(self)
+        self.channel.addItems([f"AI{i}" for i in range(1, 9)])
+        self.channel.setCurrentIndex(State.scope_channel - 1)
+        self.channel.currentIndexChanged.connect(self.set_channel)
+
+        self.slope = QtWidgets.QComboBox(self)
+        self.slope.addItems([it.value for it in TriggerSlope])
+        self.slope.setCurrentText(State.scope_slope.value)
+        self.slope.currentIndexChanged.connect(self.set_slope)
+
+        self.level = QtWidgets.QDoubleSpinBox(self)
+        self.level.setRange(-10, 10)
+        self.level.setDecimals(3)
+        self.level.setSingleStep(0.1)
+        self.level.setValue(State.scope_level)
+        self.level.valueChanged.connect(self.set_level)
+
+        self.trigger_mode = QtWidgets.QComboBox(self)
+        self.trigger_mode.addItems([it.value for it in TriggerMode])
+        self.trigger_mode.setCurrentText(State.scope_trigger_mode.value)
+        self.trigger_mode.currentIndexChanged.connect(self.set_trigger_mode)
+
+        self.record_length = QtWidgets.QSpinBox(self)
+        self.record_length.setRange(10, 1000000)
+        self.record_length.setValue(State.scope_record_length)
+        self.record_length.valueChanged.connect(self.set_record_length)
+
+        self.pre_trigger = QtWidgets.QSpinBox(self)
+        self.pre_trigger.setRange(0, 100)
+        self.pre_trigger.setSuffix(" %")
+        self.pre_trigger.setValue(int(State.scope_pre_trigger * 100))
+        self.pre_trigger.valueChanged.connect(self.set_pre_trigger)
+
+        self.btn_arm = QtWidgets.QPushButton("Arm", self)
+        self.btn_arm.clicked.connect(self.armed.emit)
+
+        self.trigger_widgets = []
+        hlayout.addWidget(QtWidgets.QLabel("Mode:", self))
+        hlayout.addWidget(self.plot_mode)
+        for label, widget in (
+            ("Trigger:", self.channel),
+            (None, self.slope),
+            ("Level, V:", self.level),
+            (None, self.trigger_mode),
+            ("Samples:", self.record_length),
+            ("Pre-trigger:", self.pre_trigger),
+            (None, self.btn_arm),
+        ):
+            if label:
+                label_widget = QtWidgets.QLabel(label, self)
+                hlayout.addWidget(label_widget)
+                self.trigger_widgets.append(label_widget)
+            hlayout.addWidget(widget)
+            self.trigger_widgets.append(widget)
+        hlayout.addStretch()
+        self.setLayout(hlayout)
+        self.set_trigger_widgets_hidden()
+
+    def set_trigger_widgets_hidden(self):
+        for widget in self.trigger_widgets:
+            widget.setHidden(State.plot_mode != "Scope")
+        self.btn_arm.setHidden(State.plot_mode != "Scope" or State.scope_trigger_mode != TriggerMode.Single)
+
+    def set_plot_mode(self, value):
+        State.plot_mode = value
+        self.set_trigger_widgets_hidden()
+        self.mode_changed.emit(value)
+
+    def set_channel(self, index):
+        State.scope_channel = index + 1
+        self.trigger_changed.emit()
+
+    def set_slope(self, index):
+        State.scope_slope = TriggerSlope.get_by_index(index)
+        self.trigger_changed.emit()
+
+    def set_level(self, value):
+        State.scope_level = float(value)
+        self.trigger_changed.emit()
+
+    def set_trigger_mode(self, index):
+        State.scope_trigger_mode = TriggerMode.get_by_index(index)
+        self.set_trigger_widgets_hidden()
+        self.trigger_changed.emit()
+
+    def set_record_length(self, value):
+        State.scope_record_length = int(value)
+        self.trigger_changed.emit()
+
+    def set_pre_trigger(self, value):
+        State.scope_pre_trigger = value / 100
+        self.trigger_changed.emit()
@@ -0,0 +1,71 @@
+"""
+Throughput and latency benchmarks of the acquisition, storage and render paths.
+
+Every case runs in a fresh process against the simulated DAQ122, so its
+peak RSS is its own. Results are printed, or written with ``--output``,
+as JSON for comparing runs:
+
+    python -m benchmarks --cases loop plot --rates 100000 200000 --channels 1 8
+"""
+import argparse
+import json
+import multiprocessing
+import platform
+import sys
+from datetime import datetime
+
+from api.structures import DAQSampleRate
+from benchmarks.cases import cases
+from benchmarks.runner import run_case
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--cases", nargs="+", default=list(cases), choices=list(cases))
+    parser.add_argument(
+        "--rates",
+        nargs="+",
+        type=int,
+        default=[sr.value for sr in DAQSampleRate],
+        choices=[sr.value for sr in DAQSampleRate],
+    )
+    parser.add_argument("--channels", nargs="+", type=int, default=list(range(1, 9)), choices=list(range(1, 9)))
+    parser.add_argument("-e", "--epr", default=100, type=int, help="Elements per request, capped at the sample rate")
+    parser.add_argument("-d", "--duration", default=2.0, type=float, help="Seconds per case, or of data to save")
+    parser.add_argument("--plot-window", default=10000, type=int, help="Points per curve in the plot case")
+    parser.add_argument("-o", "--output", default=None, help="JSON file, printed if omitted")
+    args = parser.parse_args()
+
+    options = {"plot": {"plot_window": args.plot_window}}
+    results = []
+    context = multiprocessing.get_context("spawn")
+    for name in args.cases:
+        for sample_rate in args.rates:
+            for count in args.channels:
+                case_args = (name, sample_rate, list(range(1, count + 1)), args.epr, args.duration)
+                with context.Pool(1) as pool:
+                    result = pool.apply(run_case, case_args + (options.get(name, {}),))
+                print(
+                    f"{name:>5} {sample_rate:>6} Hz x{count}: {result['samples_per_s']:,.0f} samples/s, "
+                    f"p99 {result['latency_ms']['p99'] or 0:.2f} ms, {result['peak_rss_mb'] or 0:.0f} MB",
+                    file=sys.stderr,
+                )
+                results.append(result)
+
+    report = {
+        "started": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "duration": args.duration,
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+"""
+Benchmark cases, each run in a fresh process against the simulated DAQ122.
+
+Every case returns a dict with ``samples`` processed, ``elapsed`` seconds
+and the ``latencies`` of its cycles in seconds; ``__main__`` turns them
+into rates and percentiles.
+"""
+import os
+import tempfile
+import time
+from typing import Dict, List
+
+import numpy as np
+
+from acquisition.engine import AcquisitionEngine
+from acquisition.frame import Frame
+from acquisition.frame_buffer import FrameBuffer
+from acquisition.sinks import FrameSink, StatisticsSink, StoreSink
+from acquisition.statistics import StatisticsEngine
+from api.sim_daq122 import SimDAQ122
+from api.structures import DAQADCChannel, DAQSampleRate, DAQVoltage
+from store.channel_store import ChannelStore
+
+
+def bench_read(sample_rate: DAQSampleRate, channels: List[int], epr: int, duration: float) -> Dict:
+    """``DAQ122.read_data`` of every channel in turn, one cycle per round."""
+    latencies = []
+    samples = 0
+    with SimDAQ122() as daq:
+        daq.configure_sampling_parameters(DAQVoltage.Voltage5V, sample_rate)
+        daq.config_adc_channel(DAQADCChannel.AIN_ALL)
+        daq.start_collection()
+        started = time.perf_counter()
+        while time.perf_counter() - started < duration:
+            cycle = time.perf_counter()
+            for channel in channels:
+                success, data = daq.read_data(epr, channel - 1, timeout=1000)
+                if success:
+                    samples += len(data)
+            latencies.append(time.perf_counter() - cycle)
+        elapsed = time.perf_counter() - started
+    return {"samples": samples, "elapsed": elapsed, "latencies": latencies}
+
+
+def bench_loop(sample_rate: DAQSampleRate, channels: List[int], epr: int, duration: float) -> Dict:
+    """``AcquisitionEngine.poll`` with the sinks of ``MeasureThread``, one cycle per poll."""
+    store = ChannelStore(channels, capacity=int(sample_rate.value * (duration + 1)))
+    engine = AcquisitionEngine(channels, DAQVoltage.Voltage5V, sample_rate, epr, daq_class=SimDAQ122)
+    engine.add_sink(StatisticsSink(StatisticsEngine(channels)))
+    engine.add_sink(StoreSink(store))
+    engine.add_sink(FrameSink(FrameBuffer()))
+    latencies = []
+    engine.start()
+    try:
+        while engine.elapsed < duration:
+            time.sleep(engine.poll_interval)
+            cycle = time.perf_counter()
+            engine.poll()
+            latencies.append(time.perf_counter() - cycle)
+        elapsed = engine.elapsed
+    finally:
+        engine.stop()
+    samples = sum(len(array) for array in store.values())
+    return {
+        "samples": samples,
+        "elapsed": elapsed,
+        "latencies": latencies,
+        "timeouts": engine.reader.scheduler.timeouts,
+        "overruns": sum(engine.overruns.values()),
+    }
+
+
+def bench_save(sample_rate: DAQSampleRate, channels: List[int], epr: int, duration: float) -> Dict:
+    """``SaveWorker`` (the body of ``MeasureManager.save_by_index``) and ``cli.save_to_hdf5``."""
+    from cli import save_to_hdf5
+    from store.data import MeasureModel
+    from store.saver import SaveWorker
+
+    count = int(sample_rate.value * duration)
+    store = ChannelStore(channels)
+    rng = np.random.default_rng()
+    for channel in channels:
+        store[channel].extend(rng.normal(size=count))
+    measure = MeasureModel(
+        data={
+            "sample_rate": sample_rate.value,
+            "voltage": DAQVoltage.Voltage5V.name,
+            "epr": epr,
+            "decimation": 1,
+            "filter": "",
+            "is_average": False,
+            "data": store,
+        }
+    )
+    latencies = {"save_worker": [], "cli": []}
+    with tempfile.TemporaryDirectory() as directory:
+        filepath = os.path.join(directory, "bench.h5")
+        for _ in range(3):
+            cycle = time.perf_counter()
+            SaveWorker(measure, filepath).run()
+            latencies["save_worker"].append(time.perf_counter() - cycle)
+
+            cycle = time.perf_counter()
+            save_to_hdf5(
+                filepath,
+                [store[channel].view() for channel in channels],
+                channels,
+                sample_rate.value,
+                DAQVoltage.Voltage5V.name,
+                duration,
+                False,
+                epr,
+            )
+            latencies["cli"].append(time.perf_counter() - cycle)
+    elapsed = sum(latencies["save_worker"]) + sum(latencies["cli"])
+    return {
+        "samples": 6 * count * len(channels),
+        "elapsed": elapsed,
+        "latencies": latencies["save_worker"] + latencies["cli"],
+        "save_worker_s": float(np.mean(latencies["save_worker"])),
+        "cli_s": float(np.mean(latencies["cli"])),
+    }
+
+
+def bench_plot(
+    sample_rate: DAQSampleRate, channels: List[int], epr: int, duration: float, plot_window: int = 10000
+) -> Dict:
+    """``PlotWidget.add_plots`` and the repaint, one cycle per rendered frame, offscreen."""
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt5.QtWidgets import QApplication
+
+    from application.widgets.plot import PlotWidget
+    from store.state import State
+
+    State.plot_window = plot_window
+    rng = np.random.default_rng()
+
+    app = QApplication.instance() or QApplication([])
+    widget = PlotWidget(None)
+    widget.resize(1200, 700)
+    widget.show()
+    # Start from a full plot window, as in a long measurement.
+    for channel in channels:
+        widget.add_samples(channel, np.arange(-plot_window, 0) * 0.02, rng.normal(size=plot_window))
+    app.processEvents()
+
+    block_period = epr / sample_rate.value
+    channel_tuple = tuple(channels)
+    latencies = []
+    samples = 0
+    frame_time = 0.0
+    started = time.perf_counter()
+    while time.perf_counter() - started < duration:
+        # Frames the measure thread would have pushed since the previous render.
+        now = time.perf_counter() - started
+        frames = []
+        while frame_time < now:
+            frame_time += max(block_period, 0.02)
+            frames.append(Frame(frame_time, channel_tuple, rng.normal(size=len(channels))))
+        if not frames:
+            time.sleep(0.001)
+            continue
+        cycle = time.perf_counter()
+        widget.add_plots(frames)
+        app.processEvents()
+        latencies.append(time.perf_counter() - cycle)
+        samples += len(frames) * len(channels)
+    elapsed = time.perf_counter() - started
+    widget.close()
+    return {"samples": samples, "elapsed": elapsed, "latencies": latencies}
+
+
+cases = {
+    "read": bench_read,
+    "loop": bench_loop,
+    "save": bench_save,
+    "plot": bench_plot,
+}
@@ -0,0 +1,52 @@
+"""
+Runs one benchmark case and summarizes it, in the worker process of the case.
+"""
+import sys
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from api.structures import DAQSampleRate
+from benchmarks.cases import cases
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def peak_rss_mb() -> Optional[float]:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak / (1 << 20) if sys.platform == "darwin" else peak / (1 << 10)
+
+
+def run_case(name: str, sample_rate: int, channels: List[int], epr: int, duration: float, options: Dict) -> Dict:
+    rate = DAQSampleRate.get_by_value(sample_rate)
+    epr = min(epr, rate.value)
+    result = cases[name](rate, channels, epr, duration, **options)
+    latencies = np.asarray(result.pop("latencies")) * 1000
+    samples = result.pop("samples")
+    elapsed = result.pop("elapsed")
+    summary = {
+        "case": name,
+        "sample_rate": rate.value,
+        "channels": len(channels),
+        "epr": epr,
+        "samples": samples,
+        "elapsed_s": elapsed,
+        "samples_per_s": samples / elapsed if elapsed else None,
+        "cycles": len(latencies),
+        "latency_ms": {
+            f"p{percentile}": float(np.percentile(latencies, percentile)) if len(latencies) else None
+            for percentile in (50, 90, 99)
+        },
+        "latency_max_ms": float(latencies.max()) if len(latencies) else None,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+    if name in ("read", "loop"):
+        summary["expected_samples_per_s"] = rate.value * len(channels)
+    summary.update(result)
+    return summary
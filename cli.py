@@ -1,20 +1,52 @@
 import argparse
+import os
 import time
-import numpy as np
+from datetime import datetime
 import h5py
 import multiprocessing
+import numpy as np
 from tabulate import tabulate
-from api import get_daq_class
+from acquisition.decimation import DecimationFilter, stream_attrs, stream_factors, stream_name
+from acquisition.engine import AcquisitionEngine, Sink
+from acquisition.frame import Frame
+from acquisition.metrics import MetricsServer
+from acquisition.reader import DeviceReader
+from acquisition.shared_ring import SharedRingBuffer, SharedRingReader
+from acquisition.sinks import MetricsLog, RecorderSink, StatisticsSink, StoreSink
+from acquisition.statistics import StatisticsEngine, StatisticsWindow
+from acquisition.status_board import StatusBoard
 from api.exceptions import DeviceError
-from api.structures import DAQSampleRate, DAQVoltage, DAQADCChannel
+from api.sim_daq122 import SimDll
+from api.structures import DAQSampleRate, DAQVoltage
+from store.channel_store import ChannelStore
+from store.recorder import HDF5Recorder, write_timebase
 import curses
 
 
-def save_to_hdf5(filename, data, channels, sample_rate, voltage, duration, averaging, epr):
+def save_to_hdf5(
+    filename,
+    data,
+    channels,
+    sample_rate,
+    voltage,
+    duration,
+    averaging,
+    epr,
+    timebases=None,
+    streams=None,
+    decimation=1,
+    decimation_filter="",
+):
     with h5py.File(filename, "w") as file:
         data_group = file.create_group("data")
         for i, channel in enumerate(channels):
             data_group.create_dataset(f"channel_{channel}", data=data[i])
+            if timebases and channel in timebases:
+                write_timebase(file, channel, timebases[channel])
+        for name, store in (streams or {}).items():
+            stream_group = file.require_group("streams").create_group(name)
+            stream_group.attrs.update(store.attrs)
+            store.write_hdf5(stream_group)
 
         params_group = file.create_group("parameters")
         params_group.attrs["sample_rate"] = sample_rate
@@ -22,34 +54,75 @@ def save_to_hdf5(filename, data, channels, sample_rate, voltage, duration, avera
         params_group.attrs["duration"] = duration
         params_group.attrs["averaging"] = averaging
         params_group.attrs["epr"] = epr
+        params_group.attrs["decimation"] = decimation
+        params_group.attrs["filter"] = decimation_filter
+
+
+class DisplaySink(Sink):
+    """Publishes the latest mean, block count, lost samples and statistics of every channel on a StatusBoard."""
+
+    def __init__(self, board: StatusBoard, channels, statistics: StatisticsEngine):
+        self.board = board
+        self.rows = {channel: row for row, channel in enumerate(channels)}
+        self.statistics = statistics
+        self.count = 0
+        self.engine = None
+        self.table = np.full((len(self.rows), len(StatusBoard.fields)), np.nan)
+
+    def open(self, engine):
+        self.engine = engine
 
+    def write(self, channel, index, blocks, means):
+        self.count += len(blocks)
 
-def display_table(queue, channels):
+    def frame(self, frame: Frame):
+        for channel, value in zip(frame.channels, frame.values.tolist()):
+            summary = self.statistics.summary(channel)
+            lost = self.engine.overruns[channel] + self.engine.dropped[channel]
+            self.table[self.rows[channel]] = [frame.time, value, self.count, lost] + [
+                summary[name] for name in StatusBoard.fields[4:]
+            ]
+        self.board.write(self.table)
+
+    def close(self):
+        self.board.finish()
+
+
+def display_table(board_name, channels, refresh=0.1):
+    board = StatusBoard.attach(board_name, len(channels))
     stdscr = curses.initscr()
     curses.noecho()
     curses.cbreak()
     stdscr.nodelay(True)
 
     try:
-        while True:
-            data = queue.get()
-            if data is None:
-                break
+        sequence = 0
+        while not board.is_finished:
+            time.sleep(refresh)  # Пауза для обновления консоли
+            data = board.read()
+            if data is None or data[0] == sequence:
+                continue
+            sequence, table = data
 
             stdscr.clear()
-            table_data = [["Channel", "Time", "Average Data", "Count"]]
-            for channel, (duration, average_data, count) in zip(channels, data):
-                table_data.append([channel, f"{duration:5.3f}", f"{average_data:8.6f}", count])
+            table_data = [["Channel", "Time", "Average Data", "Count", "Lost", "Mean", "Min", "Max", "RMS", "Std"]]
+            for channel, (duration, average_data, count, lost, *summary) in zip(channels, table.tolist()):
+                if np.isnan(duration):
+                    continue
+                table_data.append(
+                    [channel, f"{duration:5.3f}", f"{average_data:8.6f}", int(count), int(lost)]
+                    + [f"{value:8.6f}" for value in summary]
+                )
 
             table_str = tabulate(table_data, headers="firstrow", tablefmt="grid")
             stdscr.addstr(0, 0, table_str)
             stdscr.refresh()
-            time.sleep(0.1)  # Пауза для обновления консоли
     finally:
         curses.nocbreak()
         stdscr.keypad(False)
         curses.echo()
         curses.endwin()
+        board.close()
 
 
 def main():
@@ -67,80 +140,401 @@ def main():
     parser.add_argument(
         "-v", "--voltage", action="store", default="Voltage5V", choices=[vt.name for vt in DAQVoltage], type=str
     )
-    parser.add_argument("-a", "--average", action="store_true")
+    parser.add_argument(
+        "-a",
+        "--average",
+        action="store_true",
+        help="Store EpR block means only, same as --no-raw --decimate SAMPLE_RATE/EPR --filter boxcar",
+    )
+    parser.add_argument(
+        "--decimate",
+        action="append",
+        type=float,
+        metavar="RATE",
+        help="Also store a stream decimated to RATE Hz, independent of EpR; repeat for several streams",
+    )
+    parser.add_argument(
+        "--filter",
+        default=DecimationFilter.FIR.value,
+        choices=[it.value for it in DecimationFilter],
+        help="Anti-aliasing filter of the decimated streams",
+    )
+    parser.add_argument(
+        "--no-raw", action="store_true", help="Do not store raw samples, the first decimated stream goes to data/"
+    )
     parser.add_argument("-d", "--duration", default=60, type=int)
     parser.add_argument("-o", "--output", default="data.h5", type=str, help="Output HDF5 file")
+    parser.add_argument(
+        "--stats-window",
+        default=StatisticsWindow.Cumulative.value,
+        choices=[it.value for it in StatisticsWindow],
+        help="Window of the channel statistics",
+    )
+    parser.add_argument(
+        "--stats-length", default=100, type=int, help="Sliding window length or exponential span, blocks"
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Write samples to the output file while measuring instead of keeping them in memory",
+    )
+    parser.add_argument(
+        "--flush-interval", default=1.0, type=float, help="Seconds between writes to the output file in stream mode"
+    )
+    parser.add_argument(
+        "--compression",
+        default=None,
+        choices=[it for it in HDF5Recorder.compressions if it],
+        help="Compression of the streamed datasets",
+    )
+    parser.add_argument(
+        "-l", "--latency", default=20, type=float, help="Target latency of device polling, ms (at least one EpR)"
+    )
+
+    parser.add_argument(
+        "--pipeline",
+        action="store_true",
+        help="Read the device, write the output file and compute statistics in separate processes "
+        "sharing memory ring buffers, the output file is always streamed",
+    )
+    parser.add_argument(
+        "--ring-duration", default=5.0, type=float, help="Seconds of samples kept per channel in pipeline mode"
+    )
+    parser.add_argument(
+        "--stats", action="store_true", help="Print acquisition metrics when the measurement ends (single process)"
+    )
+    parser.add_argument("--metrics-file", default=None, help="Append acquisition metrics to a JSON-lines file")
+    parser.add_argument("--metrics-interval", default=1.0, type=float, help="Seconds between metrics lines")
+    parser.add_argument(
+        "--metrics-port", default=None, type=int, help="Serve acquisition metrics on http://127.0.0.1:PORT/metrics"
+    )
+    parser.add_argument(
+        "--simulate", action="store_true", help="Use the simulated device instead of the DAQ122 library"
+    )
+    parser.add_argument(
+        "--sim-waveform", default="sine", choices=SimDll.waveforms, help="Waveform of the simulated device"
+    )
+    parser.add_argument(
+        "--sim-frequency", default=10.0, type=float, help="Waveform frequency of the simulated device, Hz"
+    )
 
     args = parser.parse_args()
+    if args.simulate:
+        os.environ["DAQ122_BACKEND"] = "sim"
+        os.environ["DAQ122_SIM_WAVEFORM"] = args.sim_waveform
+        os.environ["DAQ122_SIM_FREQUENCY"] = str(args.sim_frequency)
+
+    board = StatusBoard(len(args.channel))
+    display_process = multiprocessing.Process(target=display_table, args=(board.name, args.channel))
+    display_process.start()
+    metrics = None
+    try:
+        if args.pipeline:
+            run_pipeline(args, board)
+        else:
+            metrics = run(args, board)
+    finally:
+        board.finish()
+        display_process.join()
+        board.close()
+        board.unlink()
+    print(f"\nData saved to {args.output}")
+    if args.stats and metrics:
+        print_metrics(metrics)
 
-    voltage = DAQVoltage[args.voltage]
-    sample_rate = DAQSampleRate.get_by_value(args.sample_rate)
 
-    data_to_save = [[] for _ in args.channel]
+def get_parameters(args):
+    decimations, kind = get_decimation(args)
+    primary = stream_attrs(args.sample_rate, decimations[0], kind)
+    return {
+        "sample_rate": args.sample_rate,
+        "voltage": args.voltage,
+        "duration": args.duration,
+        "averaging": primary["filter"] == DecimationFilter.Boxcar.value and primary["decimation"] == args.epr,
+        "epr": args.epr,
+        "decimation": primary["decimation"],
+        "filter": primary["filter"],
+    }
 
-    DAQ122 = get_daq_class()
 
-    queue = multiprocessing.Queue()
-    display_process = multiprocessing.Process(target=display_table, args=(queue, args.channel))
-    display_process.start()
+def get_decimation(args):
+    """Returns the decimation factors of the stored streams, the primary one first, and their filter."""
+    if args.average:
+        return [args.epr], DecimationFilter.Boxcar
+    return stream_factors(args.sample_rate, not args.no_raw, args.decimate or []), DecimationFilter(args.filter)
 
-    try:
-        with DAQ122() as daq:
-            if daq.is_connected():
-                print("Device is connected")
-
-            if daq.configure_sampling_parameters(voltage, sample_rate):
-                print("Sampling parameters configured")
-
-            if daq.config_adc_channel(DAQADCChannel.AIN_ALL):
-                daq.start_collection()
-
-                count = 0
-                start = time.time()
-
-                while True:
-                    time.sleep(args.epr / sample_rate / 2)
-                    channel_data = []
-                    for channel_index, channel in enumerate(args.channel):
-                        success, data = daq.read_data(
-                            read_elements_count=args.epr, channel_number=channel - 1, timeout=5000
-                        )
-                        if success:
-                            duration = time.time() - start
-                            read_data = data[: args.epr]
-                            average_data = np.mean(read_data)
-                            if args.average:
-                                data_to_save[channel_index].append(average_data)
-                            else:
-                                data_to_save[channel_index].extend(read_data)
-
-                            count += 1
-                            channel_data.append((duration, average_data, count))
-
-                            if duration > args.duration:
-                                break
-
-                    queue.put(channel_data)
-                    if duration > args.duration:
-                        break
 
+def get_streams(args):
+    """Returns the names, decimation factors and attributes of the streams stored next to the primary one."""
+    decimations, kind = get_decimation(args)
+    return {
+        stream_name(factor, kind): (factor, stream_attrs(args.sample_rate, factor, kind)) for factor in decimations[1:]
+    }
+
+
+def create_engine(args, reader=None):
+    return AcquisitionEngine(
+        channels=args.channel,
+        voltage=DAQVoltage[args.voltage],
+        sample_rate=DAQSampleRate.get_by_value(args.sample_rate),
+        read_elements_count=args.epr,
+        duration=None if reader else args.duration,
+        target_latency=args.latency / 1000,
+        reader=reader,
+    )
+
+
+def create_statistics(args):
+    return StatisticsEngine(
+        args.channel,
+        window=StatisticsWindow(args.stats_window),
+        length=args.stats_length,
+        alpha=2 / (args.stats_length + 1),
+    )
+
+
+def create_recorder(args):
+    recorder = HDF5Recorder(
+        args.output,
+        channels=args.channel,
+        groups={"parameters": get_parameters(args)},
+        compression=args.compression,
+        streams={name: attrs for name, (_, attrs) in get_streams(args).items()},
+    )
+    recorder.open()
+    return recorder
+
+
+def add_recorder_sinks(engine, recorder, args):
+    decimations, kind = get_decimation(args)
+    engine.add_sink(RecorderSink(recorder, decimations[0], kind, flush_interval=args.flush_interval))
+    for name, (factor, _) in get_streams(args).items():
+        engine.add_sink(RecorderSink(recorder, factor, kind, stream=name, flush_interval=args.flush_interval))
+
+
+def close_recorder(recorder):
+    recorder.close(attrs={"finished": datetime.now().strftime("%Y-%m-%d %H:%M:%S")})
+
+
+def run(args, board):
+    data_to_save = None
+    recorder = None
+    decimations, kind = get_decimation(args)
+    if args.stream:
+        recorder = create_recorder(args)
+    else:
+        data_to_save = ChannelStore(args.channel)
+        for name, (_, attrs) in get_streams(args).items():
+            data_to_save.streams[name] = ChannelStore(args.channel, attrs=attrs)
+    statistics = create_statistics(args)
+
+    engine = create_engine(args)
+    engine.add_sink(StatisticsSink(statistics))
+    if recorder:
+        add_recorder_sinks(engine, recorder, args)
+    else:
+        engine.add_sink(StoreSink(data_to_save, decimations[0], kind))
+        for name, (factor, _) in get_streams(args).items():
+            engine.add_sink(StoreSink(data_to_save.streams[name], factor, kind))
+    engine.add_sink(DisplaySink(board, args.channel, statistics))
+    if args.metrics_file:
+        engine.add_sink(MetricsLog(engine, args.metrics_file, args.metrics_interval))
+    server = None
+    if args.metrics_port:
+        server = MetricsServer(engine, args.metrics_port)
+        server.start()
+
+    try:
+        engine.start()
+        print("Device is connected")
+        print("Sampling parameters configured")
+        engine.run()
     except (DeviceError, KeyboardInterrupt) as e:
         print(f"Error: {e}")
     finally:
-        queue.put(None)
-        display_process.join()
-        data_to_save = [np.array(channel_data) for channel_data in data_to_save]
-        save_to_hdf5(
-            args.output,
-            data_to_save,
-            args.channel,
-            sample_rate.value,
-            voltage.name,
-            args.duration,
-            args.average,
-            args.epr,
+        if server:
+            server.stop()
+        if recorder:
+            close_recorder(recorder)
+        else:
+            save_to_hdf5(
+                args.output,
+                [data_to_save[channel].view() for channel in args.channel],
+                args.channel,
+                args.sample_rate,
+                args.voltage,
+                args.duration,
+                get_parameters(args)["averaging"],
+                args.epr,
+                data_to_save.timebases,
+                data_to_save.streams,
+                get_parameters(args)["decimation"],
+                get_parameters(args)["filter"],
+            )
+    return engine.metrics()
+
+
+def print_metrics(metrics):
+    print(
+        tabulate(
+            [
+                ["Elapsed, s", f"{metrics['elapsed_s']:.3f}"],
+                ["Expected samples per channel", metrics.get("expected_samples", 0)],
+                ["Read calls", metrics.get("read_calls", 0)],
+                ["Read timeouts", metrics.get("read_timeouts", 0)],
+                ["Stored, MB", f"{metrics.get('stored_bytes', 0) / (1 << 20):.1f}"],
+            ]
+            + [
+                [f"{name.replace('_', ' ').capitalize()} {key[:-3]}, ms", f"{metrics[name][key]:.3f}"]
+                for name in ("read_latency", "loop_time")
+                if name in metrics
+                for key in ("p50_ms", "p99_ms", "max_ms")
+            ],
+            tablefmt="grid",
+        )
+    )
+    print(
+        tabulate(
+            [
+                [
+                    channel,
+                    metrics["acquired_samples"][channel],
+                    metrics["read_failures"][channel],
+                    metrics["overrun_samples"][channel],
+                    metrics["dropped_samples"][channel],
+                    metrics["buffer_overflows"][channel],
+                    metrics["backlog_samples"][channel],
+                ]
+                for channel in metrics.get("acquired_samples", {})
+            ],
+            headers=[
+                "Channel",
+                "Acquired",
+                "Read failures",
+                "Overrun samples",
+                "Dropped samples",
+                "Full buffer reads",
+                "Backlog",
+            ],
+            tablefmt="grid",
+        )
+    )
+
+
+def run_pipeline(args, board):
+    """
+    Runs acquisition, writing and statistics in three processes.
+
+    The acquisition process only drains the device into shared memory rings,
+    so disk stalls, compression and GC pauses of the consumers cannot delay
+    ``DAQ122_TryReadData``. Consumers that fall more than ``--ring-duration``
+    behind lose the overwritten samples and report them as overruns.
+    """
+    capacity = max(int(args.sample_rate * args.ring_duration), 2 * args.epr)
+    rings = {channel: SharedRingBuffer(capacity) for channel in args.channel}
+    ring_names = {channel: ring.name for channel, ring in rings.items()}
+    status = multiprocessing.Queue()
+    results = multiprocessing.Queue()
+    stop = multiprocessing.Event()
+    started = multiprocessing.Value("d", 0.0)
+    acquirer = multiprocessing.Process(
+        target=acquire_process, args=(args, ring_names, capacity, status, stop, started)
+    )
+    consumers = [
+        multiprocessing.Process(
+            target=consume_process, args=(args, ring_names, capacity, role, board.name, results, started)
         )
-        print(f"\nData saved to {args.output}")
+        for role in ("writer", "stats")
+    ]
+    try:
+        acquirer.start()
+        error = status.get()
+        if error:
+            print(f"Error: {error}")
+            return
+        print("Device is connected")
+        print("Sampling parameters configured")
+        for consumer in consumers:
+            consumer.start()
+        acquirer.join()
+    except KeyboardInterrupt as e:
+        print(f"Error: {e}")
+    finally:
+        stop.set()
+        acquirer.join()
+        for consumer in consumers:
+            if consumer.pid is not None:
+                consumer.join()
+        while not status.empty():
+            print(f"Error: {status.get()}")
+        while not results.empty():
+            role, overruns, dropped = results.get()
+            for channel in overruns:
+                if overruns[channel]:
+                    print(f"{role}: channel {channel} lost {overruns[channel]} samples")
+                if dropped[channel]:
+                    print(f"{role}: channel {channel} missed {dropped[channel]} samples dropped by the device")
+        for ring in rings.values():
+            ring.close()
+            ring.unlink()
+
+
+def acquire_process(args, ring_names, capacity, status, stop, collection_started):
+    rings = {channel: SharedRingBuffer.attach(name, capacity) for channel, name in ring_names.items()}
+    reader = DeviceReader(
+        channels=args.channel,
+        voltage=DAQVoltage[args.voltage],
+        sample_rate=DAQSampleRate.get_by_value(args.sample_rate),
+        read_elements_count=args.epr,
+        target_latency=args.latency / 1000,
+        rings=rings,
+    )
+    reader.start()
+    reader.ready.wait()
+    started = reader.error is None
+    collection_started.value = reader.started
+    status.put(None if started else str(reader.error))
+    try:
+        deadline = time.time() + args.duration
+        while reader.is_running and not stop.is_set() and time.time() < deadline:
+            stop.wait(0.1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        reader.stop()
+        reader.join()
+        for ring in rings.values():
+            ring.finish()
+            ring.close()
+    if started and reader.error:
+        status.put(str(reader.error))
+
+
+def consume_process(args, ring_names, capacity, role, board_name, results, started):
+    rings = {channel: SharedRingBuffer.attach(name, capacity) for channel, name in ring_names.items()}
+    engine = create_engine(args, reader=SharedRingReader(rings, started.value))
+    recorder = None
+    board = None
+    if role == "writer":
+        recorder = create_recorder(args)
+        add_recorder_sinks(engine, recorder, args)
+    else:
+        statistics = create_statistics(args)
+        board = StatusBoard.attach(board_name, len(args.channel))
+        engine.add_sink(StatisticsSink(statistics))
+        engine.add_sink(DisplaySink(board, args.channel, statistics))
+    try:
+        engine.run()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if recorder:
+            close_recorder(recorder)
+        if board:
+            board.close()
+        for ring in rings.values():
+            ring.close()
+        results.put((role, engine.overruns, engine.dropped))
 
 
 if __name__ == "__main__":
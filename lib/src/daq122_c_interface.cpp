@@ -48,4 +48,8 @@ bool DAQ122_TryReadData(DAQ122Handle handle, uint8_t channel, double *read_buffe
     );
 }
 
+uint32_t DAQ122_GetADCBufferDataSize(DAQ122Handle handle, uint8_t channel) {
+    return static_cast<libdaq::device::DAQ122*>(handle)->GetADCBufferDataSize(channel);
+}
+
 } // extern "C"
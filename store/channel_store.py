@@ -0,0 +1,310 @@
+import os
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import h5py
+import numpy as np
+
+from acquisition.timebase import Timebase
+from store.recorder import read_timebase, write_timebase
+
+
+class ChannelArray:
+    """
+    A growable, array-backed sample container for one channel.
+
+    Capacity grows by amortized doubling, ``view`` exposes the stored samples
+    without copying and ``trim`` releases the unused tail once a measurement
+    is finished, so a stored channel costs exactly ``itemsize`` bytes per sample.
+    A finished channel can be spilled to a memory-mapped ``.npy`` scratch file;
+    ``view`` keeps working on the mapping. A channel restored from an HDF5
+    dataset reads it only on first access to the samples.
+    """
+
+    __slots__ = ("_data", "_size", "_path", "_source")
+
+    min_capacity = 1024
+
+    def __init__(self, dtype=np.float64, capacity: int = 0):
+        self._data = np.empty(max(capacity, self.min_capacity), dtype=dtype)
+        self._size = 0
+        self._path: Optional[str] = None
+        self._source: Optional[Tuple[str, str]] = None
+
+    @classmethod
+    def from_hdf5(cls, filepath: str, name: str, size: int, dtype=np.float64) -> "ChannelArray":
+        """
+        Creates a channel backed by an HDF5 dataset that is read lazily.
+
+        Parameters:
+            filepath (str): HDF5 file.
+            name (str): Full dataset name inside the file.
+            size (int): Dataset length.
+            dtype: Dataset dtype.
+        """
+        array = cls(dtype)
+        array._data = np.empty(0, dtype=dtype)
+        array._size = size
+        array._source = (filepath, name)
+        return array
+
+    def _fetch(self) -> None:
+        if self._source is None:
+            return
+        filepath, name = self._source
+        with h5py.File(filepath, "r") as file:
+            self._data = file[name][: self._size]
+        self._source = None
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator:
+        return iter(self.view())
+
+    def __getitem__(self, item):
+        return self.view()[item]
+
+    def __array__(self, dtype=None, copy=None):
+        if dtype is None:
+            return self.view()
+        return self.view().astype(dtype)
+
+    @property
+    def dtype(self) -> np.dtype:
+        return self._data.dtype
+
+    @property
+    def nbytes(self) -> int:
+        return self._data.nbytes
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._source is None
+
+    @property
+    def is_spilled(self) -> bool:
+        return isinstance(self._data, np.memmap)
+
+    @property
+    def resident_nbytes(self) -> int:
+        return 0 if self.is_spilled else self._data.nbytes
+
+    def spill(self, path: str) -> None:
+        """
+        Moves the samples to a memory-mapped scratch file.
+
+        Parameters:
+            path (str): Scratch ``.npy`` file, overwritten if it exists.
+        """
+        if not self.is_loaded or self.is_spilled or not self._size:
+            return
+        mapped = np.lib.format.open_memmap(path, mode="w+", dtype=self._data.dtype, shape=(self._size,))
+        mapped[:] = self._data[: self._size]
+        mapped.flush()
+        del mapped
+        self._data = np.load(path, mmap_mode="r")
+        self._path = path
+
+    def load(self) -> None:
+        """Moves spilled samples back into memory."""
+        self._fetch()
+        if self.is_spilled:
+            self._data = np.array(self._data)
+
+    def release(self) -> None:
+        """Removes the scratch file, samples that only live in it are dropped."""
+        if self.is_spilled:
+            self._data = np.empty(0, dtype=self._data.dtype)
+            self._size = 0
+        if self._path and os.path.exists(self._path):
+            os.remove(self._path)
+        self._path = None
+
+    def reserve(self, capacity: int) -> None:
+        self._fetch()
+        if capacity <= len(self._data):
+            return
+        data = np.empty(capacity, dtype=self._data.dtype)
+        data[: self._size] = self._data[: self._size]
+        self._data = data
+        self.release()
+
+    def append(self, value: float) -> None:
+        self._fetch()
+        if self._size == len(self._data):
+            self.reserve(max(2 * len(self._data), self.min_capacity))
+        self._data[self._size] = value
+        self._size += 1
+
+    def extend(self, values) -> None:
+        self._fetch()
+        values = np.asarray(values)
+        size = self._size + len(values)
+        if size > len(self._data):
+            self.reserve(max(size, 2 * len(self._data)))
+        self._data[self._size : size] = values
+        self._size = size
+
+    def view(self) -> np.ndarray:
+        """Read-only view of the stored samples, valid until the next append."""
+        self._fetch()
+        view = self._data[: self._size]
+        view.flags.writeable = False
+        return view
+
+    def trim(self) -> None:
+        if self.is_loaded and not self.is_spilled and len(self._data) > self._size:
+            self._data = self._data[: self._size].copy()
+
+    def tolist(self) -> List[float]:
+        return self.view().tolist()
+
+
+class ChannelStore:
+    """
+    Per-channel sample storage of a measurement, a mapping of channel number to ``ChannelArray``.
+
+    A store can carry further streams of the same channels, e.g. decimated
+    ones; sizes, spilling, loading and releasing cover them too, and in HDF5
+    they are saved to ``streams/<name>`` groups next to ``data``.
+
+    Attributes:
+        dtype: Sample dtype, float64 or float32.
+        timebases (Dict[int, Timebase]): Sample times of the channels that have them.
+        attrs (Dict[str, Any]): HDF5 attributes of the stream, e.g. ``decimation.stream_attrs``.
+        streams (Dict[str, ChannelStore]): Further streams by name.
+    """
+
+    __slots__ = ("dtype", "timebases", "attrs", "streams", "_channels")
+
+    dtypes = ("float64", "float32")
+
+    def __init__(
+        self, channels: Iterable[int], dtype=np.float64, capacity: int = 0, attrs: Optional[Dict[str, Any]] = None
+    ):
+        self.dtype = np.dtype(dtype)
+        self.timebases: Dict[int, Timebase] = {}
+        self.attrs: Dict[str, Any] = attrs or {}
+        self.streams: Dict[str, ChannelStore] = {}
+        self._channels: Dict[int, ChannelArray] = {channel: ChannelArray(self.dtype, capacity) for channel in channels}
+
+    @classmethod
+    def from_hdf5(cls, filepath: str, group: str) -> "ChannelStore":
+        """
+        Restores a store from ``channel_N`` datasets of an HDF5 group without reading the samples.
+
+        Timebases are read from the dataset attributes and the ``segments`` group
+        next to the group, further streams from the ``streams`` group next to it.
+
+        Parameters:
+            filepath (str): HDF5 file.
+            group (str): Group holding the ``channel_N`` datasets.
+        """
+        channels = {}
+        timebases = {}
+        streams = {}
+        dtype = np.float64
+        with h5py.File(filepath, "r") as file:
+            parent = file[group].parent
+            for name, stream_group in parent.get("streams", {}).items():
+                streams[name] = (f"{stream_group.name}/data", dict(stream_group.attrs))
+            for name, dataset in file[group].items():
+                if not name.startswith("channel_"):
+                    continue
+                dtype = dataset.dtype
+                channel = int(name[len("channel_") :])
+                channels[channel] = ChannelArray.from_hdf5(filepath, dataset.name, dataset.shape[0], dtype)
+                timebase = read_timebase(parent, channel)
+                if timebase is not None:
+                    timebases[channel] = timebase
+        store = cls([], dtype=dtype)
+        store._channels = dict(sorted(channels.items()))
+        store.timebases = timebases
+        for name, (stream_group, attrs) in streams.items():
+            store.streams[name] = cls.from_hdf5(filepath, stream_group)
+            store.streams[name].attrs = attrs
+        return store
+
+    def write_hdf5(self, group: h5py.Group, compression: Optional[str] = None) -> None:
+        """
+        Writes the channels to ``data/channel_N`` datasets of a file or measure group, with timebases and streams.
+
+        Parameters:
+            group (h5py.Group): Parent of the ``data`` group.
+            compression (str): None, "gzip" or "lzf".
+        """
+        data_group = group.require_group("data")
+        for channel, array in self._channels.items():
+            samples = array.view()
+            data_group.create_dataset(
+                f"channel_{channel}",
+                data=samples,
+                chunks=True if len(samples) else None,
+                compression=compression if len(samples) else None,
+            )
+            if channel in self.timebases:
+                write_timebase(group, channel, self.timebases[channel])
+        for name, stream in self.streams.items():
+            stream_group = group.require_group("streams").create_group(name)
+            stream_group.attrs.update(stream.attrs)
+            stream.write_hdf5(stream_group, compression)
+
+    def __getitem__(self, channel: int) -> ChannelArray:
+        return self._channels[channel]
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._channels)
+
+    def __len__(self) -> int:
+        return len(self._channels)
+
+    def __contains__(self, channel: int) -> bool:
+        return channel in self._channels
+
+    def keys(self):
+        return self._channels.keys()
+
+    def values(self):
+        return self._channels.values()
+
+    def items(self):
+        return self._channels.items()
+
+    @property
+    def nbytes(self) -> int:
+        return sum(array.nbytes for array in self._channels.values()) + sum(
+            stream.nbytes for stream in self.streams.values()
+        )
+
+    @property
+    def resident_nbytes(self) -> int:
+        return sum(array.resident_nbytes for array in self._channels.values()) + sum(
+            stream.resident_nbytes for stream in self.streams.values()
+        )
+
+    def spill(self, directory: str, prefix: str) -> None:
+        for channel, array in self._channels.items():
+            array.spill(os.path.join(directory, f"{prefix}_channel_{channel}.npy"))
+        for name, stream in self.streams.items():
+            stream.spill(directory, f"{prefix}_{name}")
+
+    def load(self) -> None:
+        for array in self._channels.values():
+            array.load()
+        for stream in self.streams.values():
+            stream.load()
+
+    def release(self) -> None:
+        for array in self._channels.values():
+            array.release()
+        for stream in self.streams.values():
+            stream.release()
+
+    def trim(self) -> None:
+        for array in self._channels.values():
+            array.trim()
+        for stream in self.streams.values():
+            stream.trim()
+
+    def tolist(self) -> Dict[int, List[float]]:
+        return {channel: array.tolist() for channel, array in self._channels.items()}
@@ -1,15 +1,23 @@
-import json
+import atexit
+import logging
 import os
 import re
+import shutil
+import tempfile
+from collections import OrderedDict
 from datetime import datetime
-from typing import Union, Dict, Any
+from typing import Union, Dict, Any, Optional
 
-import h5py
 from PyQt5 import QtGui
-from PyQt5.QtCore import QAbstractTableModel, Qt, QModelIndex
+from PyQt5.QtCore import QAbstractTableModel, Qt, QModelIndex, QThreadPool
 from PyQt5.QtWidgets import QFileDialog
 
 from constants import DataTableColumns
+from store.saver import SaveWorker
+from store.session import SessionDumpThread, read_session
+from store.state import State
+
+logger = logging.getLogger(__name__)
 
 
 class MeasureList(list):
@@ -44,19 +52,65 @@ class MeasureList(list):
 class MeasureManager:
     table: "MeasureTableModel" = None
     _instances: MeasureList["MeasureModel"] = MeasureList()
+    _recently_used: "OrderedDict[int, MeasureModel]" = OrderedDict()
+    _scratch_dir: Optional[str] = None
+    _save_workers: Dict[int, SaveWorker] = {}
     latest_id = 0
 
     @classmethod
     def create(cls, *args, **kwargs) -> "MeasureModel":
         instance = MeasureModel(*args, **kwargs)
         cls._instances.append(instance)
+        cls.touch(instance)
         return instance
 
+    @classmethod
+    def touch(cls, measure: "MeasureModel") -> None:
+        """Marks the measure as most recently used."""
+        cls._recently_used[measure.id] = measure
+        cls._recently_used.move_to_end(measure.id)
+
+    @classmethod
+    def get_scratch_dir(cls) -> str:
+        if cls._scratch_dir is None:
+            cls._scratch_dir = tempfile.mkdtemp(prefix="daq122-")
+            atexit.register(shutil.rmtree, cls._scratch_dir, ignore_errors=True)
+        return cls._scratch_dir
+
+    @classmethod
+    def resident_nbytes(cls) -> int:
+        return sum(m.data["data"].resident_nbytes for m in cls.all() if "data" in m.data)
+
+    @classmethod
+    def enforce_memory_budget(cls) -> None:
+        """
+        Spills the sample data of least recently used finished measures to
+        memory-mapped scratch files until the resident data fits into
+        ``State.memory_budget`` megabytes.
+        """
+        budget = State.memory_budget * 1024 * 1024
+        resident = cls.resident_nbytes()
+        for measure in list(cls._recently_used.values()):
+            if resident <= budget:
+                break
+            if measure.finished == "--" or "data" not in measure.data:
+                continue
+            store = measure.data["data"]
+            before = store.resident_nbytes
+            store.spill(cls.get_scratch_dir(), prefix=f"measure_{measure.id}")
+            resident -= before - store.resident_nbytes
+            logger.info(f"Measure {measure.id} moved to disk to keep memory usage under {State.memory_budget} MB")
+
     @classmethod
     def update_table(cls):
         if isinstance(cls.table, MeasureTableModel):
             cls.table.updateData()
 
+    @classmethod
+    def update_row(cls, measure: "MeasureModel"):
+        if isinstance(cls.table, MeasureTableModel):
+            cls.table.updateRow(measure)
+
     @classmethod
     def all(cls):
         return cls._instances
@@ -78,15 +132,18 @@ class MeasureManager:
 
     @classmethod
     def delete_by_index(cls, index: int) -> None:
+        measure = cls.all()[index]
+        cls.cancel_save(measure.id)
+        cls._recently_used.pop(measure.id, None)
+        if "data" in measure.data:
+            measure.data["data"].release()
         cls.all().delete_by_index(index)
         cls.update_table()
 
     @classmethod
     def save_by_index(cls, index: int) -> None:
         measure = cls.all()[index]
-        finished = measure.finished
-        if finished == "--":
-            finished = datetime.now()
+        cls.touch(measure)
         caption = f"Saving measure {measure.id}"
         try:
             default_filename = f"{measure.comment}"
@@ -97,35 +154,117 @@ class MeasureManager:
                 return
             if not filepath.endswith(".h5"):
                 filepath += ".h5"
-            with h5py.File(filepath, "w") as hdf:
-                hdf.attrs["id"] = measure.id
-                hdf.attrs["comment"] = measure.comment
-                hdf.attrs["started"] = measure.started.strftime("%Y-%m-%d %H:%M:%S")
-                hdf.attrs["finished"] = finished.strftime("%Y-%m-%d %H:%M:%S")
-
-                data_group = hdf.create_group("data")
-                data_group.attrs["sample_rate"] = measure.data["sample_rate"]
-                data_group.attrs["voltage"] = measure.data["voltage"]
-                data_group.attrs["epr"] = measure.data["epr"]
-                data_group.attrs["is_average"] = measure.data["is_average"]
-
-                for key, value in measure.data["data"].items():
-                    data_group.create_dataset(f"channel_{key}", data=value)
-            measure.saved = True
-            measure.save(finish=False)
+            cls.start_save(measure, filepath)
         except (IndexError, FileNotFoundError):
             pass
 
     @classmethod
-    def save_all(cls):
-        data = [m.to_json() for m in cls.all()]
-        if not data:
+    def start_save(cls, measure: "MeasureModel", filepath: str) -> None:
+        """
+        Saves the measure to HDF5 on the global thread pool.
+
+        Progress is shown in the Saved column and the row is updated once the
+        save completes; several measures may be saved at once.
+        """
+        if measure.id in cls._save_workers:
+            logger.warning(f"Measure {measure.id} is already being saved")
+            return
+        worker = SaveWorker(measure, filepath)
+        worker.signals.progress.connect(cls.on_save_progress)
+        worker.signals.finished.connect(cls.on_save_finished)
+        worker.signals.error.connect(cls.on_save_error)
+        cls._save_workers[measure.id] = worker
+        measure.save_progress = 0
+        cls.update_row(measure)
+        QThreadPool.globalInstance().start(worker)
+
+    @classmethod
+    def cancel_save(cls, measure_id: int) -> None:
+        worker = cls._save_workers.get(measure_id)
+        if worker:
+            worker.cancel()
+
+    @classmethod
+    def on_save_progress(cls, measure_id: int, percent: int) -> None:
+        measure = cls.get(id=measure_id)
+        if measure:
+            measure.save_progress = percent
+            cls.update_row(measure)
+
+    @classmethod
+    def on_save_finished(cls, measure_id: int, completed: bool) -> None:
+        worker = cls._save_workers.pop(measure_id, None)
+        measure = cls.get(id=measure_id)
+        if not measure:
             return
+        measure.save_progress = None
+        if completed:
+            measure.saved = True
+            measure.filepath = worker.filepath
+            logger.info(f"Measure {measure_id} saved to {worker.filepath}")
+        else:
+            logger.info(f"Saving measure {measure_id} cancelled")
+        cls.update_row(measure)
+
+    @classmethod
+    def on_save_error(cls, measure_id: int, msg: str) -> None:
+        cls._save_workers.pop(measure_id, None)
+        measure = cls.get(id=measure_id)
+        if measure:
+            measure.save_progress = None
+            cls.update_row(measure)
+        logger.error(f"Unable to save measure {measure_id}: {msg}")
+
+    @classmethod
+    def save_all(cls) -> Optional[SessionDumpThread]:
+        """
+        Dumps all measures to a binary HDF5 session file in a background thread.
+
+        Returns:
+            SessionDumpThread: The started dump thread, None if there is nothing to dump.
+        """
+        measures = cls.all()
+        if not measures:
+            return None
         if not os.path.exists("dumps"):
             os.mkdir("dumps")
-        filepath = f"dumps/dump_{datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}.json"
-        with open(filepath, "w", encoding="utf-8") as file:
-            json.dump(data, file, ensure_ascii=False, indent=4)
+        filepath = f"dumps/dump_{datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}.h5"
+        thread = SessionDumpThread(filepath, measures)
+        thread.signals.finished.connect(cls.on_session_saved)
+        thread.signals.error.connect(cls.on_session_error)
+        thread.start()
+        return thread
+
+    @staticmethod
+    def on_session_saved(filepath: str) -> None:
+        logger.info(f"Session saved to {filepath}")
+
+    @staticmethod
+    def on_session_error(filepath: str, msg: str) -> None:
+        logger.error(f"Unable to save session to {filepath}: {msg}")
+
+    @classmethod
+    def load_session(cls, filepath: str) -> None:
+        """
+        Restores measures from a session dump, samples are read when first needed.
+
+        Parameters:
+            filepath (str): Session dump written by ``save_all``.
+        """
+        taken_ids = {m.id for m in cls.all()}
+        for record in read_session(filepath):
+            measure = MeasureModel(data=record["data"], finished=record["finished"])
+            if record["id"] not in taken_ids:
+                measure.id = record["id"]
+                cls.latest_id = max(cls.latest_id, measure.id)
+            measure.started = record["started"]
+            measure.comment = record["comment"]
+            measure.saved = record["saved"]
+            measure.filepath = record["filepath"]
+            taken_ids.add(measure.id)
+            cls._instances.append(measure)
+            cls.touch(measure)
+        cls.update_table()
 
 
 class MeasureModel:
@@ -150,18 +289,41 @@ class MeasureModel:
         self.finished = finished
         self.saved = False
         self.comment = ""
+        self.filepath = None
+        self.save_progress: Optional[int] = None
 
     def get_attr_by_ind(self, ind: int):
         attr = self.ind_attr_map.get(ind)
         if attr:
             return getattr(self, attr)
 
+    @property
+    def saved_state(self) -> Union[bool, str]:
+        if self.save_progress is None:
+            return self.saved
+        return f"{self.save_progress}%"
+
     def save(self, finish: bool = True):
         if finish:
             self.finished = datetime.now()
         self.objects.update_table()
 
+    def get_hdf5_attrs(self) -> Dict:
+        finished = self.finished
+        if finished == "--":
+            finished = datetime.now()
+        return {
+            "id": self.id,
+            "comment": self.comment,
+            "started": self.started.strftime("%Y-%m-%d %H:%M:%S"),
+            "finished": finished.strftime("%Y-%m-%d %H:%M:%S"),
+        }
+
+    def get_hdf5_data_attrs(self) -> Dict:
+        return {key: self.data[key] for key in ("sample_rate", "voltage", "epr", "decimation", "filter", "is_average")}
+
     def to_json(self):
+        self.objects.touch(self)
         finished = self.finished
         if finished == "--":
             finished = datetime.now()
@@ -170,7 +332,7 @@ class MeasureModel:
             "comment": self.comment,
             "started": self.started.strftime("%Y-%m-%d %H:%M:%S"),
             "finished": finished.strftime("%Y-%m-%d %H:%M:%S"),
-            "data": self.data,
+            "data": {**self.data, "data": self.data["data"].tolist()},
         }
 
 
@@ -211,9 +373,17 @@ class MeasureTableModel(QAbstractTableModel):
     def updateData(self):
         self.beginResetModel()
         measures = self.manager.all()
-        self._data = [[m.id, m.comment, m.started, m.finished, m.saved] for m in measures]
+        self._data = [[m.id, m.comment, m.started, m.finished, m.saved_state] for m in measures]
         self.endResetModel()
 
+    def updateRow(self, measure: MeasureModel):
+        for row, values in enumerate(self._data):
+            if values[0] != measure.id:
+                continue
+            self._data[row] = [measure.id, measure.comment, measure.started, measure.finished, measure.saved_state]
+            self.dataChanged.emit(self.index(row, 0), self.index(row, self.columnCount(None) - 1))
+            return
+
     def headerData(self, section, orientation, role):
         if role == Qt.ItemDataRole.DisplayRole:
             if orientation == Qt.Orientation.Horizontal:
@@ -0,0 +1,158 @@
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+import h5py
+import numpy as np
+
+from acquisition.timebase import Timebase, segment_columns
+
+
+def write_timebase(group: h5py.Group, channel: int, timebase: Timebase) -> None:
+    """
+    Writes the timebase of ``data/channel_N`` of a file or measure group.
+
+    The start time, sample rate and decimation become attributes of the
+    dataset; the segment table goes to ``segments/channel_N``, whose
+    ``missing`` attribute is the total of lost samples of the channel.
+    """
+    name = f"channel_{channel}"
+    group["data"][name].attrs.update(timebase.to_attrs())
+    segments = group.require_group("segments")
+    if name in segments:
+        del segments[name]
+    dataset = segments.create_dataset(name, data=timebase.segment_table())
+    dataset.attrs["columns"] = segment_columns
+    dataset.attrs["missing"] = timebase.missing
+
+
+def read_timebase(group: h5py.Group, channel: int) -> Optional[Timebase]:
+    """Reads a timebase written by ``write_timebase``, None if the channel has none."""
+    name = f"channel_{channel}"
+    dataset = group["data"][name]
+    segments = group["segments"][name][()] if name in group.get("segments", {}) else None
+    return Timebase.from_attrs(dataset.attrs, segments, dataset.shape[0])
+
+
+class HDF5Recorder:
+    """
+    Appends sample blocks to resizable, chunked HDF5 datasets while a measurement runs.
+
+    The file gets the same ``data/channel_N`` layout as ``MeasureManager.save_by_index``
+    and ``cli.save_to_hdf5``, so existing readers keep working. Attributes are
+    written at open and can be updated on close, timebases with ``set_timebase``.
+    Further streams of the channels, e.g. decimated ones, get the same layout
+    in ``streams/<name>`` groups, as written by ``ChannelStore.write_hdf5``.
+
+    Attributes:
+        filepath (str): Output HDF5 file.
+        channels (list): Channel numbers, one dataset each.
+    """
+
+    compressions = (None, "gzip", "lzf")
+
+    def __init__(
+        self,
+        filepath: str,
+        channels: Iterable[int],
+        attrs: Optional[Dict[str, Any]] = None,
+        data_attrs: Optional[Dict[str, Any]] = None,
+        groups: Optional[Dict[str, Dict[str, Any]]] = None,
+        compression: Optional[str] = None,
+        chunk_size: int = 65536,
+        dtype=np.float64,
+        streams: Optional[Dict[str, Dict[str, Any]]] = None,
+    ):
+        """
+        Initializes the recorder, the file is created by ``open``.
+
+        Parameters:
+            filepath (str): Output HDF5 file.
+            channels (Iterable[int]): Channel numbers, one dataset each.
+            attrs (dict): Root attributes.
+            data_attrs (dict): Attributes of the ``data`` group.
+            groups (dict): Extra groups with their attributes, e.g. ``{"parameters": {...}}``.
+            compression (str): None, "gzip" or "lzf".
+            chunk_size (int): Samples per HDF5 chunk.
+            dtype: Dataset dtype.
+            streams (dict): Further streams with their group attributes, e.g. ``{"fir_100": {...}}``.
+        """
+        if compression not in self.compressions:
+            raise ValueError(f"Unsupported compression {compression}")
+        self.filepath = filepath
+        self.channels = list(channels)
+        self.attrs = attrs or {}
+        self.data_attrs = data_attrs or {}
+        self.groups = groups or {}
+        self.compression = compression
+        self.chunk_size = chunk_size
+        self.dtype = dtype
+        self.streams = streams or {}
+        self._file: Optional[h5py.File] = None
+        self._datasets: Dict[Tuple[Optional[str], int], h5py.Dataset] = {}
+
+    def __enter__(self) -> "HDF5Recorder":
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    @property
+    def is_open(self) -> bool:
+        return self._file is not None
+
+    def open(self) -> None:
+        self._file = h5py.File(self.filepath, "w")
+        self._file.attrs.update(self.attrs)
+        data_groups = {None: self._file.create_group("data")}
+        data_groups[None].attrs.update(self.data_attrs)
+        for name, attrs in self.groups.items():
+            self._file.create_group(name).attrs.update(attrs)
+        for name, attrs in self.streams.items():
+            stream_group = self._file.require_group("streams").create_group(name)
+            stream_group.attrs.update(attrs)
+            data_groups[name] = stream_group.create_group("data")
+        for stream, data_group in data_groups.items():
+            for channel in self.channels:
+                self._datasets[stream, channel] = data_group.create_dataset(
+                    f"channel_{channel}",
+                    shape=(0,),
+                    maxshape=(None,),
+                    chunks=(self.chunk_size,),
+                    dtype=self.dtype,
+                    compression=self.compression,
+                    shuffle=self.compression is not None,
+                )
+
+    def append(self, channel: int, samples: np.ndarray, stream: Optional[str] = None) -> None:
+        dataset = self._datasets[stream, channel]
+        count = len(samples)
+        if not count:
+            return
+        size = dataset.shape[0]
+        dataset.resize((size + count,))
+        dataset[size:] = samples
+
+    def set_timebase(self, channel: int, timebase: Timebase, stream: Optional[str] = None) -> None:
+        write_timebase(self._file if stream is None else self._file["streams"][stream], channel, timebase)
+
+    def flush(self) -> None:
+        if self._file is not None:
+            self._file.flush()
+
+    def close(self, attrs: Optional[Dict[str, Any]] = None, data_attrs: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Finalizes attributes and closes the file.
+
+        Parameters:
+            attrs (dict): Root attributes to update.
+            data_attrs (dict): ``data`` group attributes to update.
+        """
+        if self._file is None:
+            return
+        if attrs:
+            self._file.attrs.update(attrs)
+        if data_attrs:
+            self._file["data"].attrs.update(data_attrs)
+        self._file.close()
+        self._file = None
+        self._datasets = {}
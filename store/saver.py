@@ -0,0 +1,85 @@
+import os
+import threading
+
+from PyQt5.QtCore import QObject, QRunnable, pyqtSignal
+
+from store.recorder import HDF5Recorder
+
+
+class SaveSignals(QObject):
+    progress = pyqtSignal(int, int)  # measure id, percent
+    finished = pyqtSignal(int, bool)  # measure id, completed (False if cancelled)
+    error = pyqtSignal(int, str)  # measure id, message
+
+
+class SaveWorker(QRunnable):
+    """
+    Writes one measure to HDF5 on a thread pool, in chunks, reporting progress.
+
+    Attributes:
+        measure_id (int): Id of the saved measure.
+        filepath (str): Output HDF5 file, removed if the save is cancelled.
+        signals (SaveSignals): Progress, completion and error notifications.
+    """
+
+    chunk_size = 1 << 20
+
+    def __init__(self, measure, filepath: str):
+        """
+        Initializes the worker, attributes of the measure are captured immediately.
+
+        Parameters:
+            measure (MeasureModel): Measure to save.
+            filepath (str): Output HDF5 file.
+        """
+        super().__init__()
+        self.setAutoDelete(False)
+        self.measure_id = measure.id
+        self.filepath = filepath
+        self.store = measure.data["data"]
+        self.attrs = measure.get_hdf5_attrs()
+        self.data_attrs = measure.get_hdf5_data_attrs()
+        self.signals = SaveSignals()
+        self._cancel_event = threading.Event()
+
+    def cancel(self) -> None:
+        self._cancel_event.set()
+
+    def run(self) -> None:
+        try:
+            completed = self._write()
+        except (OSError, ValueError) as e:
+            self.signals.error.emit(self.measure_id, str(e))
+            return
+        if not completed and os.path.exists(self.filepath):
+            os.remove(self.filepath)
+        self.signals.finished.emit(self.measure_id, completed)
+
+    def _write(self) -> bool:
+        stores = {None: self.store, **self.store.streams}
+        total = max(sum(len(array) for store in stores.values() for array in store.values()), 1)
+        written = 0
+        percent = 0
+        with HDF5Recorder(
+            self.filepath,
+            channels=self.store.keys(),
+            attrs=self.attrs,
+            data_attrs=self.data_attrs,
+            dtype=self.store.dtype,
+            streams={name: stream.attrs for name, stream in self.store.streams.items()},
+        ) as recorder:
+            for stream, store in stores.items():
+                for channel, array in store.items():
+                    samples = array.view()
+                    if channel in store.timebases:
+                        recorder.set_timebase(channel, store.timebases[channel], stream)
+                    for start in range(0, len(samples), self.chunk_size):
+                        if self._cancel_event.is_set():
+                            return False
+                        chunk = samples[start : start + self.chunk_size]
+                        recorder.append(channel, chunk, stream)
+                        written += len(chunk)
+                        if written * 100 // total != percent:
+                            percent = written * 100 // total
+                            self.signals.progress.emit(self.measure_id, percent)
+        return not self._cancel_event.is_set()
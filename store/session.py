@@ -0,0 +1,117 @@
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import h5py
+from PyQt5.QtCore import QObject, pyqtSignal
+
+from store.channel_store import ChannelStore
+
+SESSION_FORMAT = "daq122-session"
+SESSION_VERSION = 1
+
+
+def dump_measures(filepath: str, measures: List[Any], compression: Optional[str] = None) -> None:
+    """
+    Writes measures to a binary session dump, one ``measure_<id>`` group per measure.
+
+    Every group holds the same attributes and ``data``, ``segments`` and
+    ``streams`` layout as a file saved by ``MeasureManager.save_by_index``. The file is flushed after
+    each measure, so an interrupted dump keeps the measures written so far.
+
+    Parameters:
+        filepath (str): Output HDF5 file.
+        measures (List[MeasureModel]): Measures to dump.
+        compression (str): None, "gzip" or "lzf".
+    """
+    with h5py.File(filepath, "w") as file:
+        file.attrs["format"] = SESSION_FORMAT
+        file.attrs["version"] = SESSION_VERSION
+        for measure in measures:
+            group = file.create_group(f"measure_{measure.id}")
+            group.attrs.update(measure.get_hdf5_attrs())
+            group.attrs["saved"] = measure.saved
+            group.attrs["filepath"] = measure.filepath or ""
+            group.create_group("data").attrs.update(measure.get_hdf5_data_attrs())
+            measure.data["data"].write_hdf5(group, compression)
+            file.flush()
+
+
+def read_session(filepath: str) -> List[Dict]:
+    """
+    Reads measure records from a session dump without reading the samples.
+
+    Returns:
+        list: Dicts with ``id``, ``comment``, ``started``, ``finished``,
+        ``saved``, ``filepath`` and ``data`` in ``MeasureModel.data`` form,
+        whose channel arrays are read from the dump on first access.
+    """
+    records = []
+    with h5py.File(filepath, "r") as file:
+        if file.attrs.get("format") != SESSION_FORMAT:
+            raise ValueError(f"{filepath} is not a session dump")
+        groups = sorted(file.values(), key=lambda group: int(group.attrs["id"]))
+        for group in groups:
+            data_attrs = group["data"].attrs
+            records.append(
+                {
+                    "id": int(group.attrs["id"]),
+                    "comment": str(group.attrs["comment"]),
+                    "started": datetime.strptime(group.attrs["started"], "%Y-%m-%d %H:%M:%S"),
+                    "finished": datetime.strptime(group.attrs["finished"], "%Y-%m-%d %H:%M:%S"),
+                    "saved": bool(group.attrs["saved"]),
+                    "filepath": str(group.attrs["filepath"]) or None,
+                    "data": {
+                        "sample_rate": int(data_attrs["sample_rate"]),
+                        "voltage": str(data_attrs["voltage"]),
+                        "epr": int(data_attrs["epr"]),
+                        # Dumps from before decimation streams stored EpR block means or raw samples.
+                        "decimation": int(
+                            data_attrs.get("decimation", data_attrs["epr"] if data_attrs.get("is_average") else 1)
+                        ),
+                        "filter": str(data_attrs.get("filter", "boxcar" if data_attrs.get("is_average") else "")),
+                        "is_average": bool(data_attrs.get("is_average", False)),
+                        "data": None,
+                    },
+                    "group": group.name,
+                }
+            )
+    for record in records:
+        record["data"]["data"] = ChannelStore.from_hdf5(filepath, f"{record.pop('group')}/data")
+    return records
+
+
+class SessionDumpSignals(QObject):
+    finished = pyqtSignal(str)  # filepath
+    error = pyqtSignal(str, str)  # filepath, message
+
+
+class SessionDumpThread(threading.Thread):
+    """
+    Writes a session dump in the background.
+
+    The thread is not a daemon, so the interpreter waits for a dump in
+    progress on exit instead of leaving a truncated file.
+
+    Attributes:
+        filepath (str): Output HDF5 file.
+        error (Exception): Error that stopped the dump, if any.
+        signals (SessionDumpSignals): Completion and error notifications.
+    """
+
+    def __init__(self, filepath: str, measures: List[Any], compression: Optional[str] = None):
+        super().__init__()
+        self.filepath = filepath
+        self.measures = list(measures)
+        self.compression = compression
+        self.error: Optional[Exception] = None
+        self.signals = SessionDumpSignals()
+
+    def run(self) -> None:
+        try:
+            dump_measures(self.filepath, self.measures, self.compression)
+        except (OSError, ValueError) as e:
+            self.error = e
+            self.signals.error.emit(self.filepath, str(e))
+            return
+        self.signals.finished.emit(self.filepath)
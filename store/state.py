@@ -1,7 +1,10 @@
-from typing import List
+from typing import List, Optional
 
 from PyQt5.QtCore import QObject, pyqtSignal, pyqtProperty
 
+from acquisition.decimation import DecimationFilter
+from acquisition.statistics import StatisticsWindow
+from acquisition.trigger import TriggerMode, TriggerSlope
 from api.structures import DAQSampleRate, DAQVoltage, DAQADCChannel
 
 
@@ -31,8 +34,27 @@ class State:
     selected_channels: List[int] = []
     is_measuring: bool = False
     plot_window: int = 20
+    ui_fps: int = 30
+    plot_mode: str = "Trend"
+    scope_channel: int = 1
+    scope_slope: TriggerSlope = TriggerSlope.Rising
+    scope_level: float = 0.0
+    scope_trigger_mode: TriggerMode = TriggerMode.Auto
+    scope_record_length: int = 1000
+    scope_pre_trigger: float = 0.1
+    stats_window: StatisticsWindow = StatisticsWindow.Cumulative
+    stats_length: int = 100
+    log_max_lines: int = 500
     duration: int = 60
     read_elements_count = ReadElementsCountModel()
-    is_average: bool = True
+    store_raw: bool = False
+    # Hz, stored next to or instead of raw samples; none stores one mean per EpR block, as before streams.
+    decimated_rates: List[float] = []
+    decimation_filter: DecimationFilter = DecimationFilter.Boxcar
     is_plot_data: bool = False
     store_data: bool = True
+    target_latency: float = 0.02
+    store_dtype: str = "float64"
+    memory_budget: int = 1024  # MB of sample data kept in RAM by stored measures
+    stream_data: bool = False
+    compression: Optional[str] = None
@@ -0,0 +1,33 @@
+import numpy as np
+import pytest
+
+from acquisition.decimation import DecimationFilter, Decimator
+
+
+@pytest.mark.parametrize("kind", list(DecimationFilter))
+def test_chunked_output_equals_whole_signal(kind):
+    signal = np.random.default_rng(0).normal(size=1000)
+    whole = Decimator(10, kind)
+    expected = np.concatenate((whole.process(signal), whole.flush()))
+
+    chunked = Decimator(10, kind)
+    points = [chunked.process(chunk) for chunk in np.split(signal, [3, 10, 17, 250, 251, 600])]
+    points.append(chunked.flush())
+
+    assert len(expected) == 100
+    np.testing.assert_allclose(np.concatenate(points), expected)
+
+
+def test_filter_state_is_kept_across_blocks():
+    decimator = Decimator(4, DecimationFilter.Boxcar)
+
+    assert decimator.process(np.array([1.0, 2.0, 3.0])).tolist() == []
+    assert decimator.process(np.array([4.0, 5.0, 6.0, 7.0, 8.0, 9.0])).tolist() == [2.5, 6.5]
+    assert decimator.flush().tolist() == []
+
+
+def test_index_jump_ends_segment():
+    decimator = Decimator(2, DecimationFilter.Boxcar)
+
+    assert decimator.process(np.array([1.0, 3.0, 5.0]), index=0).tolist() == [2.0]
+    assert decimator.process(np.array([10.0, 20.0]), index=10).tolist() == [15.0]
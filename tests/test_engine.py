@@ -0,0 +1,65 @@
+import numpy as np
+
+from acquisition.engine import AcquisitionEngine
+from acquisition.ring_buffer import RingBuffer
+from acquisition.shared_ring import SharedRingReader
+from api.structures import DAQSampleRate, DAQVoltage
+
+
+def create_engine(capacity: int = 100, epr: int = 10):
+    ring = RingBuffer(capacity)
+    engine = AcquisitionEngine(
+        channels=[1],
+        voltage=DAQVoltage.Voltage5V,
+        sample_rate=DAQSampleRate.SampleRate1K,
+        read_elements_count=epr,
+        reader=SharedRingReader({1: ring}, started=1.0),
+    )
+    engine.start()
+    return engine, ring
+
+
+def test_partial_block_before_gap_is_dropped():
+    engine, ring = create_engine()
+    ring.write(np.arange(15.0))
+    assert engine.poll() is not None
+    ring.skip(4)
+    ring.write(np.arange(19.0, 40.0))
+
+    frame = engine.poll()
+
+    assert frame is not None
+    assert engine._cursors[1] == 39
+    assert engine.dropped[1] == 9
+    assert engine.overruns[1] == 0
+
+
+def test_cursor_leaves_gap_without_new_blocks():
+    engine, ring = create_engine()
+    ring.write(np.arange(15.0))
+    engine.poll()
+    ring.skip(4)
+    ring.write(np.arange(19.0, 21.0))
+
+    assert engine.poll() is None
+    assert engine._cursors[1] == 19
+
+    ring.write(np.arange(21.0, 29.0))
+    frame = engine.poll()
+
+    assert frame is not None
+    assert engine._cursors[1] == 29
+    assert engine.dropped[1] == 9
+
+
+def test_overrun_is_counted_once():
+    engine, ring = create_engine(capacity=25)
+    ring.write(np.arange(63.0))
+
+    engine.poll()
+    ring.write(np.arange(63.0, 65.0))
+    engine.poll()
+
+    assert engine.overruns[1] == 38
+    assert engine._cursors[1] == 58
+    assert engine.dropped[1] == 0
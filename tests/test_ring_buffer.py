@@ -0,0 +1,100 @@
+import numpy as np
+
+from acquisition.ring_buffer import RingBuffer
+from acquisition.shared_ring import SharedRingBuffer
+
+
+def test_read_across_wraparound():
+    ring = RingBuffer(8)
+    ring.write(np.arange(6.0))
+    ring.write(np.arange(6.0, 12.0))
+
+    index, samples = ring.read(5)
+
+    assert index == 5
+    assert samples.tolist() == [5.0, 6.0, 7.0, 8.0, 9.0, 10.0, 11.0]
+
+
+def test_overwritten_samples_move_cursor_forward():
+    ring = RingBuffer(8)
+    ring.write(np.arange(20.0))
+
+    index, samples = ring.read(0)
+
+    assert index == 12
+    assert samples.tolist() == list(range(12, 20))
+
+
+def test_read_stops_before_gap_and_resumes_after_it():
+    ring = RingBuffer(32)
+    ring.write(np.arange(5.0))
+    ring.skip(3)
+    ring.write(np.arange(8.0, 12.0))
+
+    index, samples = ring.read(2)
+    assert (index, samples.tolist()) == (2, [2.0, 3.0, 4.0])
+
+    index, samples = ring.read(index + len(samples))
+    assert (index, samples.tolist()) == (8, [8.0, 9.0, 10.0, 11.0])
+
+    assert ring.write_index == 12
+    assert ring.skipped(0, 12) == 3
+    assert ring.skipped(6, 9) == 2
+    assert ring.next_gap(0) == (5, 8)
+    assert ring.next_gap(8) is None
+
+
+def test_read_blocks_returns_whole_blocks_only():
+    ring = RingBuffer(32)
+    ring.write(np.arange(11.0))
+
+    index, blocks = ring.read_blocks(0, 4)
+
+    assert index == 0
+    assert blocks.tolist() == [[0.0, 1.0, 2.0, 3.0], [4.0, 5.0, 6.0, 7.0]]
+
+    index, blocks = ring.read_blocks(8, 4)
+    assert (index, blocks.shape) == (8, (0, 4))
+
+
+def test_read_blocks_before_gap():
+    ring = RingBuffer(32)
+    ring.write(np.arange(6.0))
+    ring.skip(2)
+    ring.write(np.arange(8.0, 16.0))
+
+    index, blocks = ring.read_blocks(0, 4)
+    assert (index, blocks.tolist()) == (0, [[0.0, 1.0, 2.0, 3.0]])
+
+    index, blocks = ring.read_blocks(8, 4)
+    assert (index, blocks.tolist()) == (8, [[8.0, 9.0, 10.0, 11.0], [12.0, 13.0, 14.0, 15.0]])
+
+
+def test_gap_table_keeps_latest_gaps():
+    ring = RingBuffer(1000)
+    for _ in range(RingBuffer.max_gaps + 4):
+        ring.write(np.zeros(2))
+        ring.skip(1)
+
+    assert ring.next_gap(0) == (4 * 3 + 2, 4 * 3 + 3)
+    assert ring.skipped(0, ring.write_index) == RingBuffer.max_gaps
+
+
+def test_shared_ring_is_visible_to_attached_reader():
+    ring = SharedRingBuffer(8)
+    try:
+        reader = SharedRingBuffer.attach(ring.name, 8)
+        ring.write(np.arange(10.0))
+        ring.skip(2)
+        ring.write(np.arange(12.0, 14.0))
+        ring.finish()
+
+        index, samples = reader.read(4)
+        assert (index, samples.tolist()) == (6, [6.0, 7.0, 8.0, 9.0])
+        index, samples = reader.read(10)
+        assert (index, samples.tolist()) == (12, [12.0, 13.0])
+        assert reader.is_finished
+        reader.close()
+    finally:
+        ring.close()
+        ring.unlink()
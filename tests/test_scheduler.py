@@ -0,0 +1,52 @@
+from acquisition.scheduler import PollScheduler
+
+
+def create_scheduler():
+    scheduler = PollScheduler(1000, 10, target_latency=0.05)
+    scheduler.start_time = 100.0
+    return scheduler
+
+
+def test_blocks_per_wake_follow_target_latency():
+    scheduler = create_scheduler()
+
+    assert scheduler.block_period == 0.01
+    assert scheduler.blocks_per_wake == 5
+    assert PollScheduler(1000, 100, target_latency=0.02).blocks_per_wake == 1
+
+
+def test_backlog_counts_due_blocks_not_read():
+    scheduler = create_scheduler()
+
+    assert scheduler.backlog(100.0355) == 3
+    scheduler.record(0.001, True)
+    scheduler.record(0.001, True)
+    assert scheduler.backlog(100.0355) == 1
+
+
+def test_slow_read_delays_clock():
+    scheduler = create_scheduler()
+    scheduler.record(0.001, True)
+    scheduler.record(0.008, True)
+
+    assert scheduler.start_time == 100.007
+    assert scheduler.read_time == 0.001
+
+
+def test_fast_reads_update_read_time():
+    scheduler = create_scheduler()
+    scheduler.record(0.001, True)
+    scheduler.record(0.002, True)
+
+    assert scheduler.blocks_read == 2
+    assert scheduler.read_time == 0.0011
+    assert scheduler.start_time == 100.0
+
+
+def test_timeout_restarts_clock():
+    scheduler = create_scheduler()
+    scheduler.record(0.001, True)
+    scheduler.record(0.0, False)
+
+    assert scheduler.timeouts == 1
+    assert scheduler.backlog() == 0
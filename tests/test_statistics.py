@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+
+from acquisition.statistics import StatisticsWindow, StreamingStatistics
+
+
+def test_cumulative_merge_matches_numpy():
+    signal = np.random.default_rng(0).normal(3.0, 2.0, size=1000)
+    statistics = StreamingStatistics()
+    for block in np.split(signal, [1, 100, 101, 480, 999]):
+        statistics.update(block)
+
+    summary = statistics.summary()
+    assert summary["count"] == 1000
+    assert summary["mean"] == pytest.approx(signal.mean())
+    assert summary["std"] == pytest.approx(signal.std())
+    assert summary["rms"] == pytest.approx(np.sqrt((signal**2).mean()))
+    assert (summary["min"], summary["max"]) == (signal.min(), signal.max())
+
+
+def test_sliding_window_keeps_last_blocks():
+    blocks = np.random.default_rng(1).normal(size=(5, 20))
+    statistics = StreamingStatistics(StatisticsWindow.Sliding, length=3)
+    for block in blocks:
+        statistics.update(block)
+
+    window = blocks[-3:].ravel()
+    assert statistics.count == window.size
+    assert statistics.mean == pytest.approx(window.mean())
+    assert statistics.std == pytest.approx(window.std())
+    assert (statistics.min, statistics.max) == (window.min(), window.max())
+
+
+def test_empty_statistics():
+    statistics = StreamingStatistics()
+    statistics.update(np.empty(0))
+
+    summary = statistics.summary()
+    assert summary["count"] == 0
+    assert np.isnan(summary["mean"])
@@ -0,0 +1,42 @@
+import numpy as np
+
+from acquisition.status_board import StatusBoard
+
+
+def create_table(value):
+    return np.full((2, len(StatusBoard.fields)), value)
+
+
+def test_attached_reader_sees_complete_tables():
+    board = StatusBoard(2)
+    try:
+        reader = StatusBoard.attach(board.name, 2)
+        sequence, table = reader.read()
+        assert sequence == 0
+        assert np.isnan(table).all()
+
+        board.write(create_table(1.0))
+        board.write(create_table(2.0))
+        board.finish()
+
+        sequence, table = reader.read()
+        assert sequence == 4
+        assert (table == 2.0).all()
+        assert reader.is_finished
+        reader.close()
+    finally:
+        board.close()
+        board.unlink()
+
+
+def test_read_during_write_gives_up():
+    board = StatusBoard(2)
+    try:
+        board._header[0] += 1
+        assert board.read(retries=3) is None
+
+        board._header[0] += 1
+        assert board.read(retries=3)[0] == 2
+    finally:
+        board.close()
+        board.unlink()
@@ -0,0 +1,23 @@
+from acquisition.timebase import Timebase
+
+
+def test_gap_after_partial_point():
+    timebase = Timebase(0.0, 100.0, decimation=3)
+    timebase.append(0, 5)
+    timebase.append(10, 6)
+
+    assert timebase.size == 3
+    assert timebase.gaps == [(1, 5)]
+    assert timebase.missing == 5
+    assert timebase.segment_table().tolist() == [[0, 0, 0], [1, 10, 5]]
+
+
+def test_restored_gaps_after_partial_point():
+    timebase = Timebase(0.0, 100.0, decimation=3)
+    timebase.append(0, 5)
+    timebase.append(10, 6)
+
+    restored = Timebase.from_attrs(timebase.to_attrs(), timebase.segment_table(), timebase.size)
+
+    assert restored.gaps == [(1, 5)]
+    assert restored.segments == timebase.segments